@@ -3,7 +3,7 @@ import uuid
 import pickle
 import argparse
 from packaging import version
-from typing import Tuple, List, Dict, Optional, Any, Callable
+from typing import Tuple, List, Mapping, Optional, Any, Callable
 
 import numpy as np
 
@@ -98,7 +98,7 @@ else:
 
 
     def build_redrock_targets(
-        spectra: Dict[uuid.UUID, Spectrum1D],
+        spectra: Mapping[uuid.UUID, Spectrum1D],
         lambda_min_ang: float = 3500.0,
         lambda_max_ang: float = 10000.0,
         progress_callback: Optional[Callable] = None
@@ -243,6 +243,49 @@ def dump_targets(targets: List[Any], pickle_file: str):
         pickle.dump(targets, f)
 
 
+def dump_results(result: Tuple[Any, Any], out_file: str) -> None:
+    """
+    Save the redshift fits computed by redrock.
+
+    Only the zfit table is saved, as a plain structured array in the .npy
+    format, so that it can be read back without unpickling.
+
+    :param result: The (scandata, zfit) tuple returned by run_redrock().
+    :param out_file: The output file.
+    """
+    zfit = np.asarray(result[1].as_array())
+    with open(out_file, 'wb') as f:
+        np.save(f, zfit, allow_pickle=False)
+
+
+def load_results(in_file: str) -> Tuple[None, np.ndarray]:
+    """
+    Load the redshift fits saved by dump_results().
+
+    Files written by older versions, that pickled the whole result of
+    run_redrock(), can still be read.
+
+    :param in_file: The input file.
+    :return result: A (scandata, zfit) tuple. The zfit table is returned
+        as a structured array, while the scandata are not saved and are
+        always None.
+    """
+    try:
+        zfit_map = np.load(in_file, mmap_mode='r', allow_pickle=False)
+    except ValueError:
+        with open(in_file, 'rb') as f:
+            result = pickle.load(f)
+        if result is None:
+            raise ValueError("The file contains no results")
+        return None, result[1]
+
+    # Copy the data out of the memory map, so that the file is not kept
+    # open and can be removed (or overwritten) on every platform
+    zfit = np.array(zfit_map)
+    del zfit_map
+    return None, zfit
+
+
 def run_redrock_on_pickled_targets(pickle_file: str):
     try:
         with open(pickle_file, 'rb') as f:
@@ -267,8 +310,8 @@ def main() -> None:
     args = parser.parse_args()
     result = run_redrock_on_pickled_targets(args.in_pickle_file)
 
-    with open(args.out_pickle_file, "wb") as f:
-        pickle.dump(result, f)
+    if result is not None:
+        dump_results(result, args.out_pickle_file)
 
 
 if __name__ == '__main__':
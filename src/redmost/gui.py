@@ -7,15 +7,20 @@ Created on Fri Nov 24 10:33:40 2023.
 """
 from __future__ import annotations
 
+import html
 import os
-import pickle
+import re
 import sys
-import json
 import uuid
+import weakref
 import webbrowser
+from collections.abc import Mapping, MutableMapping
+from contextlib import contextmanager
+from functools import lru_cache
 from enum import Enum
 from typing import TYPE_CHECKING
 from typing import Optional, Union, Tuple, List, Dict, Callable, Any, cast
+from typing import Iterator
 
 import numpy as np
 from astropy.nddata import VarianceUncertainty  # type: ignore
@@ -41,6 +46,43 @@ if TYPE_CHECKING:
     from redmost.qt_compat import Signal
 
 
+class SeriesData:
+    """Full resolution data of a series drawn decimated by a chart view."""
+
+    def __init__(
+        self,
+        series: QtCharts.QXYSeries,
+        x_values: np.ndarray,
+        y_values: np.ndarray
+    ) -> None:
+        """
+        Store the data of a series.
+
+        :param series: The series.
+        :param x_values: x values of the points.
+        :param y_values: y values of the points.
+        """
+        self.series = series
+        self.x_values = x_values
+        self.y_values = y_values
+
+        # Bounds (x_min, y_min, x_max, y_max) of the data, or None if there
+        # are no points
+        self.bounds: Optional[Tuple[float, float, float, float]] = None
+        if len(x_values) > 0:
+            x_min, x_max = utils.minmax(x_values)
+            y_min, y_max = utils.minmax(y_values)
+            self.bounds = (x_min, y_min, x_max, y_max)
+
+        # Only the visible portion of sorted data is drawn when zooming in
+        self.is_sorted: bool = bool(np.all(x_values[1:] >= x_values[:-1]))
+
+        # Number of bins and (start, stop) indices of the points used the
+        # last time the series was decimated
+        self.n_bins: Optional[int] = None
+        self.window: Optional[Tuple[int, int]] = None
+
+
 class SpectrumQChartView(qt_api.QtCharts.QChartView):
     """Subclass of qt_api.QtCharts.QChartView with advanced features."""
     onMouseMoveSeries = qt_api.Signal(object)
@@ -51,10 +93,16 @@ class SpectrumQChartView(qt_api.QtCharts.QChartView):
 
     def __init__(self, *args: Any) -> None:
         super().__init__(*args)
+        self.qapp: QtWidgets.QApplication = get_qapp()
 
         self._last_mouse_pos: QtCore.QPointF | None = None
+        self._last_hover_pos: QtCore.QPointF | None = None
         self._static_lines_list: List[Tuple[float, str, str]] = []
-        self._lines_buffer_list: List[Tuple[float, str, str]] = []
+        # Wavelengths, names and color keys of the lines to draw, stored in
+        # parallel containers by updateLines()
+        self._lines_buffer_lambda: np.ndarray = np.empty(0)
+        self._lines_buffer_names: List[str] = []
+        self._lines_buffer_colors: List[str] = []
         self._mouse_lambda: Union[None, QtCore.QPointF] = None
         self._lines_type: Union[str, None] = None
         self.line_colors: Dict[str, str] = {
@@ -69,6 +117,15 @@ class SpectrumQChartView(qt_api.QtCharts.QChartView):
             "width": 1.5
         }
 
+        # Pens used to draw the lines, built by updateLines() from the
+        # colors and options above, and the pen of the line under the mouse
+        self._line_pens: Dict[str, QtGui.QPen] = {}
+        self._mouse_line_pen: QtGui.QPen = qt_api.QtGui.QPen(
+            qt_api.QtGui.QColor("#aa333333")
+        )
+        self._mouse_line_pen.setWidthF(1.0)
+        self._mouse_line_pen.setDashPattern((6, 6, 6, 6))
+
         self.horizontal_lock: bool = False
         self.master: bool = False
         self.show_lines: bool = False
@@ -77,6 +134,17 @@ class SpectrumQChartView(qt_api.QtCharts.QChartView):
         self.redshift: float = 0
         self.vertical_lock: bool = False
 
+        # Scroll and zoom deltas from the mouse wheel and from the middle
+        # button drag are accumulated and applied, to this view and to its
+        # siblings, at most once per frame, see wheelEvent()
+        self._pending_scroll_dx: float = 0
+        self._pending_scroll_dy: float = 0
+        self._pending_zoom_exp: float = 0
+        self._pending_timer: QtCore.QTimer = qt_api.QtCore.QTimer(self)
+        self._pending_timer.setSingleShot(True)
+        self._pending_timer.setInterval(16)
+        self._pending_timer.timeout.connect(self._flushPendingMoves)
+
         self.setDragMode(qt_api.QtCharts.QChartView.DragMode.NoDrag)
         self.setMouseTracking(True)
         self.setRubberBand(
@@ -87,7 +155,7 @@ class SpectrumQChartView(qt_api.QtCharts.QChartView):
             qt_api.QtWidgets.
             QGraphicsView.
             ViewportUpdateMode.
-            FullViewportUpdate
+            BoundingRectViewportUpdate
         )
 
         self.updateLines()
@@ -96,6 +164,38 @@ class SpectrumQChartView(qt_api.QtCharts.QChartView):
         self._sibling_locked: bool = False
         self.siblings: List[SpectrumQChartView] = []
 
+        # Last range and plot area pushed to the siblings by syncSiblingAxes
+        self._last_applied_range: Union[
+            Tuple[float, float, float, float], None
+        ] = None
+        self._last_applied_plot_area: Union[QtCore.QRectF, None] = None
+
+        # Affine coefficients (a_x, b_x, a_y, b_y) mapping widget positions
+        # to data values, see _getSeriesTransform()
+        self._series_transform: Union[
+            Tuple[float, float, float, float], None
+        ] = None
+        self._series_transform_axes: List[weakref.ref] = []
+        self.chart().plotAreaChanged.connect(
+            self._invalidateSeriesTransform
+        )
+
+        # The scene is rendered to a pixmap that is reused until the scene
+        # changes, so that repainting only the foreground (eg. the line under
+        # the mouse cursor) does not redraw all the series, see paintEvent()
+        self._scene_pixmap: Optional[QtGui.QPixmap] = None
+        self.scene().changed.connect(self._invalidateScenePixmap)
+
+        # Full resolution data of the series set with setSeriesData(). The
+        # series are drawn decimated to the resolution of the view and are
+        # decimated again when the zoom level changes or when the view is
+        # scrolled out of the window of points drawn.
+        self._series_data: List[SeriesData] = []
+        self._decimation_timer: QtCore.QTimer = qt_api.QtCore.QTimer(self)
+        self._decimation_timer.setSingleShot(True)
+        self._decimation_timer.setInterval(0)
+        self._decimation_timer.timeout.connect(self._updateDecimatedSeries)
+
         self.setSizePolicy(
             qt_api.QtWidgets.QSizePolicy(
                 qt_api.QtWidgets.QSizePolicy.Policy.Expanding,
@@ -113,29 +213,272 @@ class SpectrumQChartView(qt_api.QtCharts.QChartView):
         Tuple[float, float, float, float],
         Tuple[None, None, None, None],
     ]:
-        x_min = None
-        x_max = None
-        y_min = None
-        y_max = None
+        # The bounds of the series set with setSeriesData() are computed
+        # only once, when their data is set
+        bounds: List[Tuple[float, float, float, float]] = []
+        other_series: List[QtCharts.QXYSeries] = []
         for series in self.chart().series():
-            data: np.ndarray = np.array(
-                [(p.x(), p.y()) for p in series.points()]
-            )
-            p1x, p1y = np.min(data, axis=0)[0:2]
-            p2x, p2y = np.max(data, axis=0)[0:2]
-
-            if x_min is None:
-                x_min = p1x
-                y_min = p1y
-                x_max = p2x
-                y_max = p2y
+            for entry in self._series_data:
+                if entry.series is series:
+                    if entry.bounds is not None:
+                        bounds.append(entry.bounds)
+                    break
             else:
-                x_min = min(x_min, p1x)
-                y_min = min(y_min, p1y)
-                x_max = max(x_max, p2x)
-                y_max = max(y_max, p2y)
+                other_series.append(series)
+
+        n_points = sum(series.count() for series in other_series)
+        if n_points > 0:
+            # Copy the points of the other series in a single array, so that
+            # the bounds are computed with just one reduction
+            data: np.ndarray = np.empty((n_points, 2), dtype=np.float64)
+            start = 0
+            for series in other_series:
+                # Fill the array with two flat lists instead of building a
+                # list of tuples, this avoids allocating a tuple object for
+                # each point
+                points = series.points()
+                end = start + len(points)
+                data[start:end, 0] = [p.x() for p in points]
+                data[start:end, 1] = [p.y() for p in points]
+                start = end
+
+            (x_min, y_min), (x_max, y_max) = utils.minmax(data)
+            bounds.append((x_min, y_min, x_max, y_max))
+
+        if not bounds:
+            return None, None, None, None
+
+        bounds_array = np.array(bounds)
+        x_min, y_min = np.min(bounds_array[:, :2], axis=0)
+        x_max, y_max = np.max(bounds_array[:, 2:], axis=0)
         return x_min, y_min, x_max, y_max
 
+    def _flushPendingMoves(self) -> None:
+        dx = self._pending_scroll_dx
+        dy = self._pending_scroll_dy
+        zoom_exp = self._pending_zoom_exp
+        self._pending_scroll_dx = 0
+        self._pending_scroll_dy = 0
+        self._pending_zoom_exp = 0
+
+        # Ignore zoom changes too small to move the axes by a pixel
+        if abs(zoom_exp) > 1e-3:
+            self.zoom(2.0 ** zoom_exp)
+        if dx or dy:
+            self.scroll(dx, dy)
+
+    def _getSeriesTransform(self) -> Union[
+        Tuple[float, float, float, float],
+        None
+    ]:
+        """
+        Get the affine transform from widget positions to data values.
+
+        The coefficients are computed by mapping two reference points through
+        the whole view -> scene -> chart -> value chain and are then reused
+        until the plot area or the range of the axes change.
+
+        :return: The coefficients (a_x, b_x, a_y, b_y) so that the data value
+            is (a_x * x + b_x, a_y * y + b_y), or None if the data values
+            cannot be obtained with an affine transform.
+        """
+        if self._series_transform is not None:
+            return self._series_transform
+
+        axes = self.chart().axes()
+        if len(axes) < 2:
+            return None
+        x_axis, y_axis = axes[0:2]
+
+        # Non linear axes (eg. QLogValueAxis) cannot be handled this way
+        if not (
+            isinstance(x_axis, qt_api.QtCharts.QValueAxis) and
+            isinstance(y_axis, qt_api.QtCharts.QValueAxis)
+        ):
+            return None
+
+        # Watch the axes for any change that would make the transform stale.
+        # Only weak references are kept to not prevent the deletion of the
+        # axes removed from the chart.
+        watched_axes = [ref() for ref in self._series_transform_axes]
+        for axis in (x_axis, y_axis):
+            if any(axis is watched for watched in watched_axes):
+                continue
+            axis.rangeChanged.connect(self._invalidateSeriesTransform)
+            axis.destroyed.connect(self._invalidateSeriesTransform)
+        self._series_transform_axes = [
+            weakref.ref(x_axis), weakref.ref(y_axis)
+        ]
+
+        chart = self.chart()
+        p_0 = chart.mapToValue(chart.mapFromScene(self.mapToScene(0, 0)))
+        p_1 = chart.mapToValue(chart.mapFromScene(self.mapToScene(100, 100)))
+
+        a_x = (p_1.x() - p_0.x()) / 100
+        a_y = (p_1.y() - p_0.y()) / 100
+        self._series_transform = (a_x, p_0.x(), a_y, p_0.y())
+        return self._series_transform
+
+    def _invalidateSeriesTransform(self, *args: Any) -> None:
+        self._series_transform = None
+
+    def _getDecimationBins(
+        self,
+        series: QtCharts.QXYSeries,
+        x_values: np.ndarray
+    ) -> int:
+        """
+        Get the number of bins needed to draw a series at the current zoom.
+
+        :param series: The series.
+        :param x_values: The x values of the full resolution data.
+        :return n_bins: The number of bins, rounded up to a power of two so
+            that scrolling or small zoom changes do not require the series
+            to be decimated again.
+        """
+        if len(x_values) < 2:
+            return 0
+
+        n_pixels = self.chart().plotArea().width()
+        if n_pixels <= 0:
+            n_pixels = self.width()
+
+        data_min = min(x_values[0], x_values[-1])
+        data_max = max(x_values[0], x_values[-1])
+        data_span = data_max - data_min
+
+        zoom_factor = 1.0
+        view_range = self._getVisibleRange(series, x_values)
+        if view_range is not None:
+            zoom_factor = max(
+                1.0, data_span / (view_range[1] - view_range[0])
+            )
+
+        n_bins = max(1.0, n_pixels * zoom_factor)
+        return int(2 ** np.ceil(np.log2(n_bins)))
+
+    def _getDecimationWindow(
+        self,
+        series: QtCharts.QXYSeries,
+        x_values: np.ndarray
+    ) -> Tuple[int, int, int, int]:
+        """
+        Get the points of a series that need to be drawn at the current zoom.
+
+        :param series: The series.
+        :param x_values: The x values of the full resolution data, sorted in
+            ascending order.
+        :return vis_start: The index of the first visible point.
+        :return vis_stop: The index after the last visible point.
+        :return win_start: The index of the first point to draw.
+        :return win_stop: The index after the last point to draw. Besides the
+            visible points, the points to draw include the ones within one
+            view width on each side, so that the series does not need to be
+            decimated again at every scroll.
+        """
+        n_points = len(x_values)
+        view_range = self._getVisibleRange(series, x_values)
+        if view_range is None:
+            return 0, n_points, 0, n_points
+
+        vis_start, vis_stop = np.searchsorted(x_values, view_range)
+
+        # Include also the points just outside the view, so that the curve
+        # reaches the edges of the plot area
+        vis_start = max(0, int(vis_start) - 1)
+        vis_stop = min(n_points, int(vis_stop) + 1)
+
+        n_visible = vis_stop - vis_start
+        win_start = max(0, vis_start - n_visible)
+        win_stop = min(n_points, vis_stop + n_visible)
+        return vis_start, vis_stop, win_start, win_stop
+
+    def _getVisibleRange(
+        self,
+        series: QtCharts.QXYSeries,
+        x_values: np.ndarray
+    ) -> Optional[Tuple[float, float]]:
+        """
+        Get the range of the horizontal axis of a series.
+
+        :param series: The series.
+        :param x_values: The x values of the full resolution data.
+        :return view_range: The minimum and the maximum value of the axis,
+            or None if the axis has not been fitted to the data yet.
+        """
+        data_min = min(x_values[0], x_values[-1])
+        data_max = max(x_values[0], x_values[-1])
+
+        for axis in series.attachedAxes():
+            if axis.orientation() != qt_api.QtCore.Qt.Orientation.Horizontal:
+                continue
+            # Ignore the range of axes not yet fitted to the data
+            if axis.min() < axis.max() and axis.max() > data_min and \
+                    axis.min() < data_max:
+                return axis.min(), axis.max()
+            break
+        return None
+
+    def _decimateSeries(self, entry: SeriesData) -> None:
+        """
+        Decimate a series to the current resolution of the view.
+
+        :param entry: The series data, as stored by setSeriesData().
+        """
+        series = entry.series
+        x_values = entry.x_values
+        y_values = entry.y_values
+        old_n_bins = entry.n_bins
+        window = entry.window
+        n_points = len(x_values)
+        n_bins = self._getDecimationBins(series, x_values)
+
+        if not entry.is_sorted or n_points < 2:
+            if n_bins == old_n_bins and window is not None:
+                return
+            win_start, win_stop = 0, n_points
+        else:
+            vis_start, vis_stop, win_start, win_stop = (
+                self._getDecimationWindow(series, x_values)
+            )
+            if (
+                n_bins == old_n_bins and
+                window is not None and
+                window[0] <= vis_start and
+                vis_stop <= window[1]
+            ):
+                return
+
+        entry.n_bins = n_bins
+        entry.window = (win_start, win_stop)
+        if n_points > 0:
+            # The bins are computed for the whole data, use the same point
+            # density for the portion of the data actually drawn
+            n_bins = int(np.ceil(n_bins * (win_stop - win_start) / n_points))
+        replace_series_points(
+            series,
+            *utils.decimate_m4(
+                x_values[win_start:win_stop],
+                y_values[win_start:win_stop],
+                n_bins
+            )
+        )
+
+    def _scheduleDecimation(self, *args: Any) -> None:
+        if not self._decimation_timer.isActive():
+            self._decimation_timer.start()
+
+    def _updateDecimatedSeries(self) -> None:
+        """Decimate again the series whose resolution is not adequate."""
+        current_series = self.chart().series()
+        self._series_data = [
+            entry for entry in self._series_data
+            if any(entry.series is series for series in current_series)
+        ]
+
+        for entry in self._series_data:
+            self._decimateSeries(entry)
+
     def addSibling(self, sibling: SpectrumQChartView) -> None:
         """
         Add sibling to this widget.
@@ -144,8 +487,102 @@ class SpectrumQChartView(qt_api.QtCharts.QChartView):
         """
         if sibling not in self.siblings:
             self.siblings.append(sibling)
+            self._last_applied_range = None
             sibling.addSibling(self)
 
+    def _getLinesRect(self) -> QtCore.QRect:
+        """
+        Get the region of the viewport where the lines are drawn.
+
+        :return lines_rect: The plot area, extended up to the top of the
+            labels of the lines and to the right edge of the viewport, since
+            the labels may overflow the plot area.
+        """
+        plot_area: QtCore.QRectF = self.chart().plotArea()
+        text_height = qt_api.QtGui.QFontMetrics(
+            self.viewport().font()
+        ).height()
+        lines_rect: QtCore.QRect = self.mapFromScene(
+            plot_area.adjusted(-2, -text_height - 10, 2, 2)
+        ).boundingRect()
+        lines_rect.setRight(self.viewport().rect().right())
+        return lines_rect
+
+    def _getLinesPosition(self) -> np.ndarray:
+        """
+        Get the x position of the lines in the chart.
+
+        :return lines_x: The x coordinate of each line, in the same order as
+            in the lines buffer.
+        """
+        chart: QtCharts.QChart = self.chart()
+        x_axes = chart.axes(qt_api.QtCore.Qt.Orientation.Horizontal)
+        if not x_axes or not isinstance(
+            x_axes[0], qt_api.QtCharts.QValueAxis
+        ):
+            # Non linear axes (eg. QLogValueAxis) need a mapping per line
+            return np.array([
+                chart.mapToPosition(qt_api.QtCore.QPointF(line_lambda, 0)).x()
+                for line_lambda in self._lines_buffer_lambda.tolist()
+            ])
+
+        # Map the ends of the axis and interpolate linearly all the lines
+        x_axis: QtCharts.QValueAxis = x_axes[0]
+        lam_0, lam_1 = x_axis.min(), x_axis.max()
+        if lam_1 == lam_0:
+            return np.full(len(self._lines_buffer_lambda), np.nan)
+        x_0 = chart.mapToPosition(qt_api.QtCore.QPointF(lam_0, 0)).x()
+        x_1 = chart.mapToPosition(qt_api.QtCore.QPointF(lam_1, 0)).x()
+        return x_0 + (self._lines_buffer_lambda - lam_0) * (
+            (x_1 - x_0) / (lam_1 - lam_0)
+        )
+
+    def _isSignalConnected(self, signal: Signal) -> bool:
+        """
+        Check if a signal of this widget is connected to any slot.
+
+        :param signal: The signal.
+        :return connected: False if the signal has no receivers, True if it
+            has some or if this cannot be checked with the current Qt API.
+        """
+        try:
+            return self.receivers(signal) > 0
+        except (TypeError, AttributeError):
+            return True
+
+    def _getSiblingGroup(self) -> List[SpectrumQChartView]:
+        """
+        Get all the views linked to this one, either directly or through
+        other siblings.
+
+        :return group: The linked views, not including this one.
+        """
+        group: List[SpectrumQChartView] = [self]
+        for view in group:
+            for sibling in view.siblings:
+                if sibling not in group:
+                    group.append(sibling)
+        return group[1:]
+
+    @contextmanager
+    def _lockedSiblingGroup(self) -> Iterator[List[SpectrumQChartView]]:
+        """
+        Lock this view and all its linked views for the duration of the
+        context, so that changes applied to the group are not propagated
+        back by the siblings.
+
+        :return group: The linked views, not including this one.
+        """
+        group = self._getSiblingGroup()
+        members = [self] + group
+        for view in members:
+            view._sibling_locked = True
+        try:
+            yield group
+        finally:
+            for view in members:
+                view._sibling_locked = False
+
     def drawForeground(
         self,
         painter: QtGui.QPainter,
@@ -158,15 +595,9 @@ class SpectrumQChartView(qt_api.QtCharts.QChartView):
 
         painter.save()
         plot_area: QtCore.QRectF = self.chart().plotArea()
-        pen: QtGui.QPen = qt_api.QtGui.QPen()
-        pen_color: QtGui.QColor
 
         if self._mouse_lambda is not None:
-            pen_color = qt_api.QtGui.QColor("#aa333333")
-            pen.setColor(pen_color)
-            pen.setWidthF(1.0)
-            pen.setDashPattern((6, 6, 6, 6))
-            painter.setPen(pen)
+            painter.setPen(self._mouse_line_pen)
 
             mouse_line_x = self.chart().mapToPosition(
                 qt_api.QtCore.QPointF(self._mouse_lambda, 0.0)
@@ -188,37 +619,34 @@ class SpectrumQChartView(qt_api.QtCharts.QChartView):
             painter.restore()
             return
 
-        for line_lambda, line_name, line_type in self._lines_buffer_list:
-            pen_color = qt_api.QtGui.QColor(self.line_colors["unknown"])
-
-            if ('AE' in line_type) or ('EA' in line_type):
-                pen_color = qt_api.QtGui.QColor(self.line_colors["both"])
-            elif 'A' in line_type:
-                pen_color = qt_api.QtGui.QColor(self.line_colors["absorption"])
-            elif 'E' in line_type:
-                pen_color = qt_api.QtGui.QColor(self.line_colors["emission"])
-
-            pen_color.setAlphaF(self.line_plot_options["alpha"])
-            pen.setColor(pen_color)
-            pen.setWidthF(self.line_plot_options["width"])
-            pen.setDashPattern(self.line_plot_options["dash_pattern"])
-            painter.setPen(pen)
-
-            line_x = self.chart().mapToPosition(
-                qt_api.QtCore.QPointF(line_lambda, 0)
-            ).x()
-
-            if (line_x >= plot_area.left()) and (line_x <= plot_area.right()):
-                p_line_top = qt_api.QtCore.QPointF(
-                    line_x, plot_area.top()
-                )
-                p_line_bottom = qt_api.QtCore.QPointF(
-                    line_x, plot_area.bottom()
-                )
-                p_text_top = qt_api.QtCore.QPointF(
-                    line_x, plot_area.top() - 5
+        # Group the lines by color, so that the pen is changed only once for
+        # each color and all the lines of a color are drawn in one call
+        grouped_lines: Dict[
+            str, Tuple[List[QtCore.QLineF], List[Tuple[QtCore.QPointF, str]]]
+        ] = {}
+        lines_x = self._getLinesPosition()
+        visible_lines = np.flatnonzero(
+            (lines_x >= plot_area.left()) & (lines_x <= plot_area.right())
+        )
+        for k, line_x in zip(
+            visible_lines.tolist(), lines_x[visible_lines].tolist()
+        ):
+            line_name = self._lines_buffer_names[k]
+            color_key = self._lines_buffer_colors[k]
+            segments, labels = grouped_lines.setdefault(color_key, ([], []))
+            segments.append(
+                qt_api.QtCore.QLineF(
+                    line_x, plot_area.bottom(), line_x, plot_area.top()
                 )
-                painter.drawLine(p_line_bottom, p_line_top)
+            )
+            labels.append(
+                (qt_api.QtCore.QPointF(line_x, plot_area.top() - 5), line_name)
+            )
+
+        for color_key, (segments, labels) in grouped_lines.items():
+            painter.setPen(self._line_pens[color_key])
+            painter.drawLines(segments)
+            for p_text_top, line_name in labels:
                 painter.drawText(p_text_top, line_name)
 
         painter.restore()
@@ -235,11 +663,6 @@ class SpectrumQChartView(qt_api.QtCharts.QChartView):
         if self._sibling_locked:
             return
 
-        self._sibling_locked = True
-        for sibling in self.siblings:
-            pass
-        self._sibling_locked = False
-
         super().mouseDoubleClickEvent(event)
         self.onMouseDoubleClickSeries.emit((self.toSeriesPos(event), event))
 
@@ -268,26 +691,33 @@ class SpectrumQChartView(qt_api.QtCharts.QChartView):
             delta = mouse_pos - self._last_mouse_pos
             self._last_mouse_pos = mouse_pos
 
-            self.scroll(-delta.x(), delta.y())
+            self._pending_scroll_dx -= delta.x()
+            self._pending_scroll_dy += delta.y()
+            if not self._pending_timer.isActive():
+                self._pending_timer.start()
 
             event.accept()
+        elif (
+            self._last_hover_pos is not None and
+            abs(mouse_pos.x() - self._last_hover_pos.x()) < 1 and
+            abs(mouse_pos.y() - self._last_hover_pos.y()) < 1
+        ):
+            # Sub-pixel movements (eg. from high resolution pointing
+            # devices) would not move the line under the mouse
+            super().mouseMoveEvent(event)
+            return
 
+        self._last_hover_pos = mouse_pos
         data_pos = self.toSeriesPos(event)
 
-        self._mouse_lambda = data_pos.x()
-
-        self._sibling_locked = True
-        for sibling in self.siblings:
-            sibling._mouse_lambda = self._mouse_lambda
-            sibling.chart().update()
-            sibling.update()
-        self._sibling_locked = False
+        self._updateMouseLine(data_pos.x())
+        for sibling in self._getSiblingGroup():
+            sibling._updateMouseLine(self._mouse_lambda)
 
-        self.chart().update()
-        self.update()
         super().mouseMoveEvent(event)
 
-        self.onMouseMoveSeries.emit((data_pos, event))
+        if self._isSignalConnected(self.onMouseMoveSeries):
+            self.onMouseMoveSeries.emit((data_pos, event))
 
     def mousePressEvent(
         self,
@@ -303,7 +733,7 @@ class SpectrumQChartView(qt_api.QtCharts.QChartView):
             return
 
         if event.button() == qt_api.QtCore.Qt.MouseButton.MiddleButton:
-            get_qapp().setOverrideCursor(
+            self.qapp.setOverrideCursor(
                 qt_api.QtCore.Qt.CursorShape.SizeAllCursor
             )
 
@@ -330,13 +760,13 @@ class SpectrumQChartView(qt_api.QtCharts.QChartView):
         if self._sibling_locked:
             return
 
-        self._sibling_locked = True
-        for sibling in self.siblings:
-            sibling.mouseReleaseEvent(event)
-        self._sibling_locked = False
-
+        # NOTE: The event is not forwarded to the siblings, their axes are
+        #       synchronized by syncSiblingAxes() once the event is handled.
         if event.button() == qt_api.QtCore.Qt.MouseButton.MiddleButton:
-            get_qapp().restoreOverrideCursor()
+            self.qapp.restoreOverrideCursor()
+            # Do not wait for the timer to apply the last drag movements
+            self._pending_timer.stop()
+            self._flushPendingMoves()
             event.accept()
         elif event.button() == qt_api.QtCore.Qt.MouseButton.RightButton:
             qt_api.QtWidgets.QGraphicsView.mouseReleaseEvent(self, event)
@@ -347,8 +777,81 @@ class SpectrumQChartView(qt_api.QtCharts.QChartView):
         self.onMouseReleaseSeries.emit((self.toSeriesPos(event), event))
         band = self.rubberBand()
         if band != qt_api.QtCharts.QChartView.RubberBand.NoRubberBand:
+            self._scheduleDecimation()
             self.syncSiblingAxes()
 
+    def _invalidateScenePixmap(self, *args: Any) -> None:
+        self._scene_pixmap = None
+        # The lines drawn in the foreground follow the axes, so the whole
+        # viewport must be repainted and not only the changed scene items
+        self.viewport().update()
+
+    def _updateMouseLine(self, mouse_lambda: float) -> None:
+        """
+        Move the vertical line that follows the mouse cursor, repainting
+        only the strips of the viewport under its old and new position.
+
+        :param mouse_lambda: The new position of the line, in data units.
+        """
+        old_lambda = self._mouse_lambda
+        self._mouse_lambda = mouse_lambda
+
+        chart: QtCharts.QChart = self.chart()
+        plot_area: QtCore.QRectF = chart.plotArea()
+        viewport: QtWidgets.QWidget = self.viewport()
+        for line_lambda in (old_lambda, mouse_lambda):
+            if line_lambda is None:
+                continue
+            line_x = chart.mapToPosition(
+                qt_api.QtCore.QPointF(line_lambda, 0.0)
+            ).x()
+            line_rect = qt_api.QtCore.QRectF(
+                line_x - 2, plot_area.top() - 2, 4, plot_area.height() + 4
+            )
+            viewport.update(self.mapFromScene(line_rect).boundingRect())
+
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        viewport: QtWidgets.QWidget = self.viewport()
+
+        # The cached pixmap is rendered by the CPU, so it is used only by
+        # raster viewports: an OpenGL viewport draws the scene by itself
+        if self.isOpenGLViewport():
+            self._scene_pixmap = None
+            super().paintEvent(event)
+            return
+
+        viewport_rect: QtCore.QRect = viewport.rect()
+        scene_rect: QtCore.QRectF = self.mapToScene(
+            viewport_rect
+        ).boundingRect()
+        dpr = viewport.devicePixelRatioF()
+
+        pixmap = self._scene_pixmap
+        if (
+            pixmap is None or
+            pixmap.devicePixelRatio() != dpr or
+            pixmap.size() != viewport_rect.size() * dpr
+        ):
+            pixmap = qt_api.QtGui.QPixmap(viewport_rect.size() * dpr)
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(qt_api.QtCore.Qt.GlobalColor.transparent)
+            pixmap_painter = qt_api.QtGui.QPainter(pixmap)
+            pixmap_painter.setRenderHints(self.renderHints())
+            self.scene().render(
+                pixmap_painter,
+                qt_api.QtCore.QRectF(viewport_rect),
+                scene_rect
+            )
+            pixmap_painter.end()
+            self._scene_pixmap = pixmap
+
+        painter = qt_api.QtGui.QPainter(viewport)
+        painter.drawPixmap(0, 0, pixmap)
+        painter.setRenderHints(self.renderHints())
+        painter.setWorldTransform(self.viewportTransform())
+        self.drawForeground(painter, scene_rect)
+        painter.end()
+
     def removeSibling(self, sibling: SpectrumQChartView) -> None:
         """
         Remove a sibling to this widget.
@@ -357,17 +860,19 @@ class SpectrumQChartView(qt_api.QtCharts.QChartView):
         """
         if sibling in self.siblings:
             self.siblings.pop(self.siblings.index(sibling))
+            self._last_applied_range = None
             sibling.removeSibling(self)
 
     def scroll(self, dx: float, dy: float) -> None:
         if self._sibling_locked:
             return
 
-        self._sibling_locked = True
-        for sibling in self.siblings:
-            sibling.scroll(dx, dy)
-        self._sibling_locked = False
+        with self._lockedSiblingGroup() as group:
+            for sibling in group:
+                sibling._scroll(dx, dy)
+            self._scroll(dx, dy)
 
+    def _scroll(self, dx: float, dy: float) -> None:
         chart = self.chart()
 
         if self.vertical_lock and self.horizontal_lock:
@@ -379,6 +884,8 @@ class SpectrumQChartView(qt_api.QtCharts.QChartView):
         else:
             chart.scroll(0, dy)
 
+        self._scheduleDecimation()
+
     def setAxesRange(
         self,
         x_min: Optional[float],
@@ -389,6 +896,15 @@ class SpectrumQChartView(qt_api.QtCharts.QChartView):
         if self._sibling_locked:
             return
 
+        self._setAxesRange(x_min, y_min, x_max, y_max)
+
+    def _setAxesRange(
+        self,
+        x_min: Optional[float],
+        y_min: Optional[float],
+        x_max: Optional[float],
+        y_max: Optional[float]
+    ) -> None:
         axes = self.chart().axes()
         if len(axes) < 2:
             return
@@ -405,19 +921,120 @@ class SpectrumQChartView(qt_api.QtCharts.QChartView):
             if y_max is not None:
                 y_axis.setMax(y_max)
 
+        self._scheduleDecimation()
+
+    def isOpenGLViewport(self) -> bool:
+        """
+        Check whether the chart is drawn on an OpenGL viewport.
+
+        :return is_opengl: True if the viewport is a QOpenGLWidget.
+        """
+        return (
+            qt_api.QOpenGLWidget is not None and
+            isinstance(self.viewport(), qt_api.QOpenGLWidget)
+        )
+
+    def setOpenGLViewport(self, enabled: bool) -> bool:
+        """
+        Use an OpenGL viewport, so that the chart is drawn on the GPU.
+
+        The OpenGL viewport is opt-in, since it requires a working OpenGL
+        stack and disables the partial repaints of the viewport. It draws
+        the whole scene at each repaint instead of using the pixmap cache
+        of the raster viewport.
+
+        :param enabled: If True, use a QOpenGLWidget as viewport, otherwise
+            use a plain QWidget.
+        :return success: True if the requested viewport is in use, False if
+            OpenGL is not available.
+        """
+        if enabled and not has_opengl():
+            return False
+
+        if self.isOpenGLViewport() == enabled:
+            return True
+
+        viewport: QtWidgets.QWidget
+        update_mode: QtWidgets.QGraphicsView.ViewportUpdateMode
+        if enabled:
+            viewport = qt_api.QOpenGLWidget()
+            surface_format = qt_api.QtGui.QSurfaceFormat()
+            surface_format.setSamples(4)
+            viewport.setFormat(surface_format)
+
+            # QOpenGLWidget does not support partial updates
+            update_mode = (
+                qt_api.QtWidgets.QGraphicsView.ViewportUpdateMode.
+                FullViewportUpdate
+            )
+        else:
+            viewport = qt_api.QtWidgets.QWidget()
+            update_mode = (
+                qt_api.QtWidgets.QGraphicsView.ViewportUpdateMode.
+                BoundingRectViewportUpdate
+            )
+
+        self.setViewport(viewport)
+        self.setViewportUpdateMode(update_mode)
+        self._scene_pixmap = None
+        return True
+
     def setLinesType(self, type: str) -> None:
         self._lines_type = type
         self.updateLines()
 
     def setLinesVisible(self, show: bool) -> None:
         self.show_lines = show
-        self.chart().update()
-        self.update()
+        self.viewport().update(self._getLinesRect())
 
     def setRedshift(self, redshift: float) -> None:
         self.redshift = redshift
         self.updateLines()
 
+    def setSeriesData(
+        self,
+        series: QtCharts.QXYSeries,
+        x_values: Union[List[float], np.ndarray],
+        y_values: Union[List[float], np.ndarray]
+    ) -> None:
+        """
+        Set the points of a series, decimated to the resolution of the view.
+
+        The full resolution data is kept and the series is decimated again
+        every time the zoom level changes, so that the details of the curve
+        are shown when zooming in.
+
+        NOTE: The axes of a chart are fitted to the data only when the
+              series is attached to them, so this function should be called
+              before adding the series to the chart of this view.
+
+        :param series: The series.
+        :param x_values: x values of the points.
+        :param y_values: y values of the points.
+        """
+        x_values = np.asarray(x_values, dtype=np.float64)
+        y_values = np.asarray(y_values, dtype=np.float64)
+
+        # Non finite points are not drawn by the series
+        finite_mask = np.isfinite(x_values) & np.isfinite(y_values)
+        if not np.all(finite_mask):
+            x_values = x_values[finite_mask]
+            y_values = y_values[finite_mask]
+
+        current_series = self.chart().series()
+        self._series_data = [
+            entry for entry in self._series_data
+            if entry.series is not series and
+            any(entry.series is s for s in current_series)
+        ]
+
+        entry = SeriesData(series, x_values, y_values)
+        self._series_data.append(entry)
+        self._decimateSeries(entry)
+
+        # Check the resolution again once the series is attached to the axes
+        self._scheduleDecimation()
+
     def showLines(self) -> None:
         self.setLinesVisible(True)
 
@@ -430,7 +1047,6 @@ class SpectrumQChartView(qt_api.QtCharts.QChartView):
             return
         x_axis, y_axis = axes[0:2]
 
-        self._sibling_locked = True
         # Get current range for x and y axes
         x_min = x_axis.min()
         y_min = y_axis.min()
@@ -439,32 +1055,71 @@ class SpectrumQChartView(qt_api.QtCharts.QChartView):
 
         plot_area: QtCore.QRectF = self.chart().plotArea()
 
-        sibling_chart: QtCharts.QChart
-        sibling_plot_area: QtCore.QRectF
-        for sibling in self.siblings:
-
-            sibling.setAxesRange(x_min, y_min, x_max, y_max)
-
-            if sibling.sync_width or sibling.sync_height:
-                sibling_chart = sibling.chart()
-                sibling_chart.setPlotArea(qt_api.QtCore.QRectF())
-                sibling_plot_area = sibling_chart.plotArea()
-                if sibling.sync_width:
-                    sibling_plot_area.setX(plot_area.x())
-                    sibling_plot_area.setWidth(plot_area.width())
-
-                if sibling.sync_height:
-                    sibling_plot_area.setY(plot_area.y())
-                    sibling_plot_area.setHeight(plot_area.height())
+        # Do not bother the siblings if nothing has changed since the last
+        # time (eg. a click with the rubber band without any dragging)
+        new_range = (x_min, y_min, x_max, y_max)
+        if (
+            self._last_applied_range is not None and
+            plot_area == self._last_applied_plot_area and
+            all(
+                abs(a - b) < 1e-9 * max(1.0, abs(b))
+                for a, b in zip(new_range, self._last_applied_range)
+            )
+        ):
+            return
 
-                sibling_chart.setPlotArea(sibling_plot_area)
-                sibling_chart.update()
-                sibling.update()
+        self._last_applied_range = new_range
+        self._last_applied_plot_area = plot_area
 
-        self._sibling_locked = False
+        sibling_chart: QtCharts.QChart
+        sibling_plot_area: QtCore.QRectF
+        with self._lockedSiblingGroup() as group:
+            for sibling in group:
+                sibling._setAxesRange(x_min, y_min, x_max, y_max)
+
+                if sibling.sync_width or sibling.sync_height:
+                    sibling_chart = sibling.chart()
+                    sibling_plot_area = sibling_chart.plotArea()
+
+                    # Setting the plot area forces a relayout of the sibling
+                    # chart, so skip it when the synced edges are already in
+                    # place (eg. after a plain zoom or scroll)
+                    if (
+                        (
+                            not sibling.sync_width or (
+                                sibling_plot_area.x() == plot_area.x() and
+                                sibling_plot_area.width() ==
+                                plot_area.width()
+                            )
+                        ) and (
+                            not sibling.sync_height or (
+                                sibling_plot_area.y() == plot_area.y() and
+                                sibling_plot_area.height() ==
+                                plot_area.height()
+                            )
+                        )
+                    ):
+                        continue
+
+                    # NOTE: Resetting the plot area with an empty rect before
+                    #       reading it is useless, the automatic layout is
+                    #       computed only later in the event loop.
+                    if sibling.sync_width:
+                        sibling_plot_area.setX(plot_area.x())
+                        sibling_plot_area.setWidth(plot_area.width())
+
+                    if sibling.sync_height:
+                        sibling_plot_area.setY(plot_area.y())
+                        sibling_plot_area.setHeight(plot_area.height())
+
+                    sibling_chart.setPlotArea(sibling_plot_area)
+                    sibling_chart.update()
+                    sibling.update()
 
     def resizeEvent(self, event, QResizeEvent=None) -> None:
         super().resizeEvent(event)
+        self._invalidateSeriesTransform()
+        self._scheduleDecimation()
         if self.master:
             self.syncSiblingAxes()
 
@@ -475,24 +1130,47 @@ class SpectrumQChartView(qt_api.QtCharts.QChartView):
         :param event: The input event.
         """
         try:
-            widget_pos = event.position()
+            widget_pos = qt_api.QtCore.QPointF(event.position())
         except AttributeError:
-            widget_pos = event.pos()
+            widget_pos = qt_api.QtCore.QPointF(event.pos())
+
+        transform = self._getSeriesTransform()
+        if transform is not None:
+            a_x, b_x, a_y, b_y = transform
+            return qt_api.QtCore.QPointF(
+                a_x * widget_pos.x() + b_x,
+                a_y * widget_pos.y() + b_y
+            )
 
-        scene_pos = self.mapToScene(int(widget_pos.x()), int(widget_pos.y()))
+        # NOTE: QGraphicsView.mapToScene() has no QPointF overload, use the
+        #       inverted viewport transform to keep sub-pixel positions.
+        scene_pos = self.viewportTransform().inverted()[0].map(widget_pos)
         chart_item_pos = self.chart().mapFromScene(scene_pos)
         value_in_series = self.chart().mapToValue(chart_item_pos)
         return value_in_series
 
     def updateLines(self) -> None:
-        known_lines: List[Tuple[float, str, str]] = lines.get_lines(
-            line_type=self._lines_type,
-            z=self.redshift
-        )
+        self._line_pens = {}
+        for color_key, color in self.line_colors.items():
+            pen_color = qt_api.QtGui.QColor(color)
+            pen_color.setAlphaF(self.line_plot_options["alpha"])
+            pen = qt_api.QtGui.QPen(pen_color)
+            pen.setWidthF(self.line_plot_options["width"])
+            pen.setDashPattern(self.line_plot_options["dash_pattern"])
+            self._line_pens[color_key] = pen
 
-        self._lines_buffer_list = known_lines + self._static_lines_list
-        self.chart().update()
-        self.update()
+        all_lines = (
+            list(get_known_lines(self._lines_type, self.redshift)) +
+            self._static_lines_list
+        )
+        self._lines_buffer_lambda = np.array(
+            [line[0] for line in all_lines], dtype=np.float64
+        )
+        self._lines_buffer_names = [line[1] for line in all_lines]
+        self._lines_buffer_colors = [
+            get_line_color_key(line[2]) for line in all_lines
+        ]
+        self.viewport().update(self._getLinesRect())
 
     def wheelEvent(self, event: QtGui.QWheelEvent, **kwargs) -> None:
         """
@@ -514,17 +1192,20 @@ class SpectrumQChartView(qt_api.QtCharts.QChartView):
 
         modifiers = qt_api.QtWidgets.QApplication.keyboardModifiers()
 
-        if modifiers == qt_api.QtCore.Qt.KeyboardModifier.ShiftModifier:
+        if modifiers == qt_api.QtCore.Qt.KeyboardModifier.ControlModifier:
+            # Zoom proportionally to the wheel rotation, one wheel notch
+            # (120/5 units) zooms by a factor sqrt(2)
+            self._pending_zoom_exp += delta_y / 48.0
+        elif modifiers == qt_api.QtCore.Qt.KeyboardModifier.ShiftModifier:
             # Vertical scroll
-            self.scroll(delta_y, delta_x)
-        elif modifiers == qt_api.QtCore.Qt.KeyboardModifier.ControlModifier:
-            # Horizontal scroll
-            if delta_y > 0:
-                self.zoomIn()
-            else:
-                self.zoomOut()
+            self._pending_scroll_dx += delta_y
+            self._pending_scroll_dy += delta_x
         else:
-            self.scroll(delta_x, delta_y)
+            self._pending_scroll_dx += delta_x
+            self._pending_scroll_dy += delta_y
+
+        if not self._pending_timer.isActive():
+            self._pending_timer.start()
 
         self.onMouseWheelEvent.emit(event)
 
@@ -544,12 +1225,18 @@ class SpectrumQChartView(qt_api.QtCharts.QChartView):
         if self._sibling_locked:
             return
 
-        rect = self.chart().plotArea()
+        with self._lockedSiblingGroup() as group:
+            for sibling in group:
+                sibling._zoom(value, x_center, y_center)
+            self._zoom(value, x_center, y_center)
 
-        self._sibling_locked = True
-        for sibling in self.siblings:
-            sibling.zoom(value, x_center, y_center)
-        self._sibling_locked = False
+    def _zoom(
+        self,
+        value: float,
+        x_center: Optional[float] = None,
+        y_center: Optional[float] = None
+    ) -> None:
+        rect = self.chart().plotArea()
 
         if x_center is None:
             x_center = rect.width()/2
@@ -572,6 +1259,7 @@ class SpectrumQChartView(qt_api.QtCharts.QChartView):
             rect.moveTop(rect.y() + top_offset)
 
         self.chart().zoomIn(rect)
+        self._scheduleDecimation()
 
     def zoomIn(
         self, value: float = 2.0,
@@ -607,12 +1295,10 @@ class SpectrumQChartView(qt_api.QtCharts.QChartView):
         if self._sibling_locked:
             return
 
-        self._sibling_locked = True
-        for sibling in self.siblings:
-            sibling.zoomReset()
-        self._sibling_locked = False
-
-        self.setAxesRange(*self._getDataBounds())
+        with self._lockedSiblingGroup() as group:
+            for sibling in group:
+                sibling._setAxesRange(*sibling._getDataBounds())
+            self._setAxesRange(*self._getDataBounds())
 
 
 class QRedrockHandler(qt_api.QtCore.QObject):
@@ -624,6 +1310,10 @@ class QRedrockHandler(qt_api.QtCore.QObject):
     message: Signal = qt_api.Signal(str)
     finished: Signal = qt_api.Signal()
 
+    # Progress messages printed by redrock, matched on the raw output
+    _RE_FINISHED = re.compile(rb"finished\s+in", re.IGNORECASE)
+    _RE_TOOK = re.compile(rb"computing\s+redshifts\s+took:", re.IGNORECASE)
+
     def __init__(self) -> None:
         super().__init__()
         self.qapp = get_qapp()
@@ -644,29 +1334,46 @@ class QRedrockHandler(qt_api.QtCore.QObject):
         self._total_progress = 0
         self._total_maximum = 0
 
+        # Output of the process not yet terminated by a newline
+        self._stdout_buf: bytearray = bytearray()
+
     def _process_output(self) -> None:
         data_bytes: QtCore.QByteArray
         data_bytes = self.process.readAllStandardOutput()
-        text = bytes(data_bytes).decode()  # type: ignore
-        for line in text.splitlines():
-            simplified = ' '.join(line.lower().strip().split())
-            if ("finished in" in simplified):
+        self._stdout_buf += bytes(data_bytes)  # type: ignore
+
+        # Only complete lines are processed, so that a line (or a multibyte
+        # character) split between two reads is not lost
+        line_end = self._stdout_buf.rfind(b'\n')
+        if line_end < 0:
+            return
+        self._process_lines(bytes(self._stdout_buf[:line_end]))
+        del self._stdout_buf[:line_end + 1]
+
+    def _process_lines(self, data: bytes) -> None:
+        for line in data.splitlines():
+            if self._RE_FINISHED.search(line):
                 self._total_progress += 1
                 self.progress.emit(self._total_progress)
-            elif "computing redshifts took:" in simplified:
+            elif self._RE_TOOK.search(line):
                 self.progress.emit(self._total_maximum)
 
-        self.message.emit(str(text))
+        self.message.emit(data.decode(errors='replace'))
 
     def retrieve_results(self) -> None:
+        if self._stdout_buf:
+            self._process_lines(bytes(self._stdout_buf))
+            self._stdout_buf.clear()
+
         try:
-            with open(self._result_dump_file, 'rb') as f:
-                self.results = pickle.load(f)
+            self.results = backends.rrock.load_results(
+                self._result_dump_file
+            )
         except Exception:
             self.results = None
         self.finished.emit()
 
-    def run_redrock(self, spectra: Dict[uuid.UUID, Spectrum1D]) -> None:
+    def run_redrock(self, spectra: Mapping[uuid.UUID, Spectrum1D]) -> None:
         self.reset.emit()
         self.maximum.emit(len(spectra))
         self.message.emit(self.qapp.tr("Building targets"))
@@ -679,8 +1386,14 @@ class QRedrockHandler(qt_api.QtCore.QObject):
         self.maximum.emit(0)
         backends.rrock.dump_targets(self.targets, self._target_dump_file)
 
+        # Do not read the results of a previous run if this one fails
+        self.results = None
+        if os.path.isfile(self._result_dump_file):
+            os.remove(self._result_dump_file)
+
         self._total_maximum = 22
         self._total_progress = 0
+        self._stdout_buf.clear()
         self.maximum.emit(self._total_maximum)
         self.message.emit(self.qapp.tr("Running redrock backend"))
         self.process.start(
@@ -693,6 +1406,126 @@ class QRedrockHandler(qt_api.QtCore.QObject):
         )
 
 
+class QTaskSignals(qt_api.QtCore.QObject):
+    """Signals emitted by a QBackgroundTask."""
+
+    finished: Signal = qt_api.Signal(object)
+    failed: Signal = qt_api.Signal(object)
+
+
+class QBackgroundTask(qt_api.QtCore.QRunnable):
+    """
+    Run a function in a thread of the global QThreadPool.
+
+    The result of the function is delivered by the signal finished, or the
+    exception raised by the function by the signal failed. Since the
+    signals are emitted from the worker thread, the connected slots are
+    called in the thread of the receiver, i.e. the GUI thread.
+    """
+
+    def __init__(self, func: Callable, *args: Any, **kwargs: Any) -> None:
+        super().__init__()
+        self.signals = QTaskSignals()
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self) -> None:
+        try:
+            result = self.func(*self.args, **self.kwargs)
+        except Exception as exc:
+            signal_name, value = 'failed', exc
+        else:
+            signal_name, value = 'finished', result
+
+        try:
+            getattr(self.signals, signal_name).emit(value)
+        except RuntimeError:
+            # The signals object has been deleted in the meantime, i.e. the
+            # application is shutting down and nobody is waiting for us
+            pass
+
+
+class SpectraCache(MutableMapping):
+    """
+    Mapping of spectra UUIDs to spectra, loaded from their files.
+
+    Only the most recently used spectra are kept in memory, the other ones
+    are read again from their files when they are needed.
+    """
+
+    def __init__(
+        self,
+        files: Dict[uuid.UUID, str],
+        max_loaded: int = 16,
+        on_evict: Optional[Callable[[uuid.UUID], None]] = None
+    ) -> None:
+        """
+        Create a new cache.
+
+        :param files: The paths of the spectra files, keyed by UUID. The
+            dict is not copied, so the spectra added to or removed from it
+            are added to or removed from the cache too.
+        :param max_loaded: The maximum number of spectra kept in memory.
+            The default value is 16.
+        :param on_evict: An optional function called with the UUID of a
+            spectrum when it is removed from memory.
+        """
+        self.files = files
+        self.max_loaded = max_loaded
+        self.on_evict = on_evict
+        self._loaded: Dict[uuid.UUID, Spectrum1D] = {}
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.files
+
+    def __delitem__(self, key: uuid.UUID) -> None:
+        """
+        Remove a spectrum and its file from the cache.
+
+        :param key: The UUID of the spectrum.
+        """
+        del self.files[key]
+        if self._loaded.pop(key, None) is not None:
+            if self.on_evict is not None:
+                self.on_evict(key)
+
+    def __getitem__(self, key: uuid.UUID) -> Spectrum1D:
+        file_path = self.files[key]
+        try:
+            sp = self._loaded.pop(key)
+        except KeyError:
+            sp = loaders.read(file_path)
+        self[key] = sp
+        return sp
+
+    def __iter__(self) -> Iterator[uuid.UUID]:
+        return iter(self.files)
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def __setitem__(self, key: uuid.UUID, sp: Spectrum1D) -> None:
+        """
+        Keep in memory a spectrum already read from its file.
+
+        :param key: The UUID of the spectrum, whose file must have already
+            been added to the files of the cache.
+        :param sp: The spectrum.
+        :raises KeyError: If the file of the spectrum is unknown.
+        """
+        if key not in self.files:
+            raise KeyError(key)
+        self._loaded.pop(key, None)
+        self._loaded[key] = sp
+        while len(self._loaded) > self.max_loaded:
+            # Drop the least recently used spectrum
+            old_key = next(iter(self._loaded))
+            self._loaded.pop(old_key)
+            if self.on_evict is not None:
+                self.on_evict(old_key)
+
+
 class GlobalState(Enum):
     READY = 0
     WAITING = 1
@@ -741,46 +1574,27 @@ class AboutDialog(qt_api.QtWidgets.QDialog):
         text_edit.setHtml(html_info_text)
         text_edit.setWordWrapMode(qt_api.QtGui.QTextOption.WrapMode.NoWrap)
 
-        status_tbl: QtWidgets.QTableWidget = qt_api.QtWidgets.QTableWidget()
-        status_tbl.setColumnCount(2)
-        status_tbl.setRowCount(len(properties))
-        status_tbl.setSizePolicy(
-            qt_api.QtWidgets.QSizePolicy(
-                qt_api.QtWidgets.QSizePolicy.Policy.Expanding,
-                qt_api.QtWidgets.QSizePolicy.Policy.Expanding
-            )
-        )
-        status_tbl.setHorizontalHeaderLabels(
-            [qapp.tr("PROPERTY"), qapp.tr("VALUE")]
-        )
-
-        item_key: QtWidgets.QTableWidgetItem
-        item_val: QtWidgets.QTableWidgetItem
-        for j, (key, val) in enumerate(properties.items()):
-            item_key = qt_api.QtWidgets.QTableWidgetItem(key)
-            item_key.setFlags(qt_api.QtCore.Qt.ItemFlag.ItemIsEnabled)
-
-            item_val = qt_api.QtWidgets.QTableWidgetItem(val)
-            item_val.setFlags(qt_api.QtCore.Qt.ItemFlag.ItemIsEnabled)
-
-            status_tbl.setItem(j, 0, item_key)
-            status_tbl.setItem(j, 1, item_val)
-
-        header: Union[QtWidgets.QHeaderView, None]
-        header = status_tbl.horizontalHeader()
-        if header is None:
-            header = qt_api.QtWidgets.QHeaderView(
-                qt_api.QtCore.Qt.Orientation.Horizontal
+        # The properties never change, a rich text label is enough to show
+        # them and is much lighter than a table widget
+        html_status_text = (
+            "<table width='100%' cellspacing='0' cellpadding='4'>"
+            f"<tr><th align='left'>{qapp.tr('PROPERTY')}</th>"
+            f"<th align='left'>{qapp.tr('VALUE')}</th></tr>"
+        )
+        for key, val in properties.items():
+            html_status_text += (
+                f"<tr><td>{html.escape(key)}</td>"
+                f"<td>{html.escape(str(val))}</td></tr>"
             )
-            status_tbl.setHorizontalHeader(header)
+        html_status_text += "</table>"
 
-        header.setSectionResizeMode(
-            qt_api.QtWidgets.QHeaderView.ResizeMode.Stretch
-        )
+        status_lbl: QtWidgets.QLabel = qt_api.QtWidgets.QLabel()
+        status_lbl.setTextFormat(qt_api.QtCore.Qt.TextFormat.RichText)
+        status_lbl.setText(html_status_text)
 
         main_layout: QtWidgets.QVBoxLayout = qt_api.QtWidgets.QVBoxLayout()
         main_layout.addWidget(text_edit)
-        main_layout.addWidget(status_tbl)
+        main_layout.addWidget(status_lbl)
         main_layout.addStretch()
         main_layout.addWidget(button_box)
 
@@ -904,6 +1718,7 @@ class SettingsDialog(qt_api.QtWidgets.QDialog):
     qt_backend_combo_box: QtWidgets.QComboBox
     style_combo_box: QtWidgets.QComboBox
     icon_theme_combo_box: QtWidgets.QComboBox
+    opengl_check_box: QtWidgets.QCheckBox
 
 
 class MainWindow(qt_api.QtWidgets.QMainWindow):
@@ -993,14 +1808,80 @@ class GuiApp:
 
         self.settings: QtCore.QSettings = qt_api.QtCore.QSettings()
 
-        self.open_spectra: Dict[uuid.UUID, Spectrum1D] = {}
         self.open_spectra_files: Dict[uuid.UUID, str] = {}
+        self.open_spectra: SpectraCache = SpectraCache(
+            self.open_spectra_files, on_evict=self._forget_spectrum_arrays
+        )
         self.open_spectra_items: Dict[
             uuid.UUID, QtWidgets.QListWidgetItem
         ] = {}
         self.current_uuid: Optional[uuid.UUID] = None
+        self._last_restored_uuid: Optional[uuid.UUID] = None
         self.object_state_dict: Dict[uuid.UUID, Any] = {}
         self.current_project_file_path: Optional[str] = None
+
+        # Smoothed flux of the most recently drawn spectra, keyed by the
+        # spectrum UUID and the smoothing factor. The entries are kept in
+        # order of use, from the least to the most recently used one.
+        self._smoothing_cache: Dict[
+            Tuple[uuid.UUID, float], np.ndarray
+        ] = {}
+        self._smoothing_cache_size: int = 32
+
+        # Changes of the smoothing settings are coalesced and applied once
+        # the user stops editing them, see setSmoothingFactor()
+        self._smoothing_timer: QtCore.QTimer = qt_api.QtCore.QTimer()
+        self._smoothing_timer.setSingleShot(True)
+        self._smoothing_timer.setInterval(50)
+        self._smoothing_timer.timeout.connect(self._update_smoothed_flux)
+
+        # The mouse position shown in the status bar is updated at most once
+        # per frame, see _updateMouseLabel()
+        self._mouse_label_lambda: Optional[float] = None
+        self._mouse_label_timer: QtCore.QTimer = qt_api.QtCore.QTimer()
+        self._mouse_label_timer.setSingleShot(True)
+        self._mouse_label_timer.setInterval(16)
+        self._mouse_label_timer.timeout.connect(self._flush_mouse_label)
+
+        # Tasks running in the global thread pool, a reference is kept so
+        # that their signals are not garbage collected before delivery
+        self._background_tasks: List[QBackgroundTask] = []
+        self._smoothing_pending: List[Tuple[uuid.UUID, float]] = []
+        self._smoothed_flux_uuid: Optional[uuid.UUID] = None
+
+        # Wavelengths and check states of the rows of the lines table. They
+        # are rebuilt lazily when rows are added or removed and are kept up
+        # to date when a single item changes.
+        self._line_lams: Optional[np.ndarray] = None
+        self._line_checked: Optional[np.ndarray] = None
+
+        # Variance (and its unit) of the spectra whose uncertainty is not
+        # stored as a variance, see _get_spectrum_variance()
+        self._variance_cache: Dict[
+            uuid.UUID, Tuple[np.ndarray, units.Unit]
+        ] = {}
+
+        # Wavelengths and fluxes of the spectra as plain arrays, see
+        # _get_spectrum_arrays()
+        self._spectral_arrays: Dict[
+            uuid.UUID, Tuple[np.ndarray, np.ndarray]
+        ] = {}
+
+        # Units of the arrays of the spectra formatted as axis titles
+        self._unit_str_cache: Dict[uuid.UUID, Dict[str, str]] = {}
+
+        # Series drawn in the charts, see _update_chart_series()
+        self._chart_series: Dict[str, QtCharts.QLineSeries] = {}
+
+        # Spectrum and options of the last redraw, used to skip redrawing
+        # the charts when nothing has changed
+        self._last_draw_state: Optional[Tuple[uuid.UUID, bool, bool]] = None
+
+        # Axes of the charts, see _get_chart_axes()
+        self._chart_axes: Dict[
+            SpectrumQChartView,
+            Tuple[QtCharts.QAbstractAxis, QtCharts.QAbstractAxis]
+        ] = {}
         self.current_open_dir: Optional[str] = None
 
         self.global_state: Enum = GlobalState.READY
@@ -1145,6 +2026,8 @@ class GuiApp:
         self.flux_chart_view.setContentsMargins(0, 0, 0, 0)
         self.flux_chart_view.chart().setContentsMargins(0, 0, 0, 0)
         self.flux_chart_view.chart().layout().setContentsMargins(0, 0, 0, 0)
+        self.flux_chart_view.chart().setBackgroundRoundness(0)
+        self.flux_chart_view.chart().legend().hide()
         self.flux_chart_view.setRubberBand(
             qt_api.QtCharts.QChartView.RubberBand.RectangleRubberBand
         )
@@ -1170,6 +2053,8 @@ class GuiApp:
         self.var_chart_view.setContentsMargins(0, 0, 0, 0)
         self.var_chart_view.chart().setContentsMargins(0, 0, 0, 0)
         self.var_chart_view.chart().layout().setContentsMargins(0, 0, 0, 0)
+        self.var_chart_view.chart().setBackgroundRoundness(0)
+        self.var_chart_view.chart().legend().hide()
         self.var_chart_view.setRubberBand(
             qt_api.QtCharts.QChartView.RubberBand.NoRubberBand
         )
@@ -1194,6 +2079,8 @@ class GuiApp:
         self.wdisp_chart_view.setContentsMargins(0, 0, 0, 0)
         self.wdisp_chart_view.chart().setContentsMargins(0, 0, 0, 0)
         self.wdisp_chart_view.chart().layout().setContentsMargins(0, 0, 0, 0)
+        self.wdisp_chart_view.chart().setBackgroundRoundness(0)
+        self.wdisp_chart_view.chart().legend().hide()
         self.wdisp_chart_view.setRubberBand(
             qt_api.QtCharts.QChartView.RubberBand.NoRubberBand
         )
@@ -1218,6 +2105,8 @@ class GuiApp:
         self.sky_chart_view.setContentsMargins(0, 0, 0, 0)
         self.sky_chart_view.chart().setContentsMargins(0, 0, 0, 0)
         self.sky_chart_view.chart().layout().setContentsMargins(0, 0, 0, 0)
+        self.sky_chart_view.chart().setBackgroundRoundness(0)
+        self.sky_chart_view.chart().legend().hide()
         self.sky_chart_view.setRubberBand(
             qt_api.QtCharts.QChartView.RubberBand.NoRubberBand
         )
@@ -1353,6 +2242,14 @@ class GuiApp:
             self.doRedshiftFromLines
         )
 
+        lines_table_model = self.main_wnd.lines_table_widget.model()
+        lines_table_model.rowsInserted.connect(self._invalidate_lines_cache)
+        lines_table_model.rowsRemoved.connect(self._invalidate_lines_cache)
+        lines_table_model.modelReset.connect(self._invalidate_lines_cache)
+        self.main_wnd.lines_table_widget.itemChanged.connect(
+            self._lines_table_item_changed
+        )
+
         self.main_wnd.show_lines_check_box.toggled.connect(
             self.flux_chart_view.setLinesVisible
         )
@@ -1445,6 +2342,11 @@ class GuiApp:
                 self.settings_wnd.icon_theme_combo_box.currentIndex,
                 self.settings_wnd.icon_theme_combo_box.setCurrentIndex,
                 int
+            ),
+            "use_opengl": (
+                self.settings_wnd.opengl_check_box.checkState,
+                self.settings_wnd.opengl_check_box.setCheckState,
+                qt_api.QtCore.Qt.CheckState
             )
         }
 
@@ -1508,6 +2410,209 @@ class GuiApp:
         self.object_state_dict[self.current_uuid] = obj_state
         self.global_state = GlobalState.READY
 
+    def _clear_charts(self) -> None:
+        """Remove all the series and the axes from the charts."""
+        for chart_view in (
+            self.flux_chart_view,
+            self.var_chart_view,
+            self.wdisp_chart_view,
+            self.sky_chart_view
+        ):
+            chart = chart_view.chart()
+            chart.removeAllSeries()
+            for ax in chart.axes():
+                chart.removeAxis(ax)
+        self._chart_series = {}
+        self._chart_axes = {}
+        self._last_draw_state = None
+
+    def _get_chart_axes(
+        self,
+        chart_view: SpectrumQChartView,
+        log_y: bool,
+        reset: bool = False
+    ) -> Tuple[QtCharts.QAbstractAxis, QtCharts.QAbstractAxis]:
+        """
+        Get the x and y axes of a chart.
+
+        The axes are replaced with new ones if they are missing, if the type
+        of the y axis does not match log_y or if reset is True.
+
+        :param chart_view: The view of the chart.
+        :param log_y: Whether the y axis should be logarithmic.
+        :param reset: If True, always replace the axes.
+        :return axis_x: The x axis.
+        :return axis_y: The y axis.
+        """
+        try:
+            axis_x, axis_y = self._chart_axes[chart_view]
+        except KeyError:
+            return self._reset_chart_axes(chart_view, log_y)
+
+        if (
+            reset or
+            isinstance(axis_y, qt_api.QtCharts.QLogValueAxis) != log_y
+        ):
+            return self._reset_chart_axes(chart_view, log_y)
+        return axis_x, axis_y
+
+    def _get_spectrum_arrays(
+        self,
+        spec_uuid: uuid.UUID
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the wavelengths and the fluxes of a spectrum as plain arrays.
+
+        The arrays are extracted from the quantities of the spectrum only
+        once for each spectrum.
+
+        :param spec_uuid: The UUID of the spectrum.
+        :return wav: The wavelengths.
+        :return flux: The fluxes.
+        """
+        try:
+            return self._spectral_arrays[spec_uuid]
+        except KeyError:
+            pass
+
+        sp: Spectrum1D = self.open_spectra[spec_uuid]
+        wav = np.ascontiguousarray(sp.spectral_axis.value)
+        flux = np.ascontiguousarray(sp.flux.value)
+
+        self._spectral_arrays[spec_uuid] = (wav, flux)
+        return wav, flux
+
+    def _forget_spectrum_arrays(self, spec_uuid: uuid.UUID) -> None:
+        """
+        Drop the arrays extracted from a spectrum no longer kept in memory.
+
+        :param spec_uuid: The UUID of the spectrum.
+        """
+        self._spectral_arrays.pop(spec_uuid, None)
+        self._variance_cache.pop(spec_uuid, None)
+
+    def _read_spectrum(
+        self,
+        spec_uuid: uuid.UUID
+    ) -> Optional[Spectrum1D]:
+        """
+        Get a spectrum, reporting an error if its file cannot be read.
+
+        :param spec_uuid: The UUID of the spectrum.
+        :return sp: The spectrum, or None if it could not be read.
+        """
+        try:
+            return self.open_spectra[spec_uuid]
+        except Exception as exc:
+            file_path = self.open_spectra_files.get(spec_uuid)
+            self.msgBox.setWindowTitle(self.qapp.tr("Error"))
+            self.msgBox.setText(
+                self.qapp.tr(
+                    "An error has occurred while loading the spectrum: the "
+                    "file could not be read."
+                )
+            )
+            self.msgBox.setDetailedText(
+                f"uuid: {spec_uuid}\n"
+                f"file: {file_path}\n"
+                f"reason: {exc}"
+            )
+            self.msgBox.setIcon(qt_api.QtWidgets.QMessageBox.Icon.Critical)
+            self.msgBox.setStandardButtons(
+                qt_api.QtWidgets.QMessageBox.StandardButton.Ok
+            )
+            self.msgBox.exec()
+            return None
+
+    def _get_spectrum_variance(
+        self,
+        spec_uuid: uuid.UUID
+    ) -> Union[Tuple[np.ndarray, units.Unit], Tuple[None, None]]:
+        """
+        Get the variance of a spectrum from its uncertainty.
+
+        The variance derived from other kinds of uncertainty is computed
+        only once for each spectrum.
+
+        :param spec_uuid: The UUID of the spectrum.
+        :return var: The variance, or None if the spectrum has no known
+            uncertainty.
+        :return var_unit: The unit of the variance.
+        """
+        try:
+            return self._variance_cache[spec_uuid]
+        except KeyError:
+            pass
+
+        sp: Spectrum1D = self.open_spectra[spec_uuid]
+        uncertainty = sp.uncertainty
+
+        if isinstance(uncertainty, VarianceUncertainty):
+            return uncertainty.array, uncertainty.unit
+
+        if isinstance(uncertainty, InverseVariance):
+            var = np.reciprocal(uncertainty.array, dtype=np.float64)
+            var_unit = 1 / uncertainty.unit
+        elif isinstance(uncertainty, StdDevUncertainty):
+            var = np.square(uncertainty.array, dtype=np.float64)
+            var_unit = uncertainty.unit ** 2
+        else:
+            return None, None
+
+        self._variance_cache[spec_uuid] = (var, var_unit)
+        return var, var_unit
+
+    def _get_checked_lines_lam(self) -> List[float]:
+        """
+        Get the wavelengths of the lines checked in the lines table.
+
+        :return lines_lam: The list of wavelengths.
+        """
+        line_table: QtWidgets.QTableWidget
+        line_table = self.main_wnd.lines_table_widget
+
+        if self._line_lams is None or self._line_checked is None:
+            n_rows = line_table.rowCount()
+            self._line_lams = np.full(n_rows, np.nan)
+            self._line_checked = np.zeros(n_rows, dtype=bool)
+            if n_rows == 0:
+                return []
+
+            # Let the model find the checked rows in a single call. The
+            # wavelengths of the other rows are read when they are checked,
+            # see _lines_table_item_changed().
+            model = line_table.model()
+            checked_indexes = model.match(
+                model.index(0, 0),
+                qt_api.QtCore.Qt.ItemDataRole.CheckStateRole,
+                qt_api.QtCore.Qt.CheckState.Checked,
+                -1,
+                qt_api.QtCore.Qt.MatchFlag.MatchExactly
+            )
+            for index in checked_indexes:
+                item = line_table.item(index.row(), 0)
+                if item is not None:
+                    self._update_lines_cache_row(index.row(), item)
+
+        return self._line_lams[self._line_checked].tolist()
+
+    def _invalidate_lines_cache(self, *args: Any) -> None:
+        self._line_lams = None
+        self._line_checked = None
+
+    def _lines_table_item_changed(
+        self,
+        item: QtWidgets.QTableWidgetItem
+    ) -> None:
+        if self._line_lams is None or item.column() != 0:
+            return
+
+        row_index = item.row()
+        if row_index < 0 or row_index >= len(self._line_lams):
+            self._invalidate_lines_cache()
+        else:
+            self._update_lines_cache_row(row_index, item)
+
     def _lock(self, *args, **kwargs) -> None:
         self.main_wnd.spec_group_box.setEnabled(False)
         self.main_wnd.red_group_box.setEnabled(False)
@@ -1658,78 +2763,38 @@ class GuiApp:
         """
         self.global_state = GlobalState.LOAD_OBJECT_STATE
 
-        # Clear current content of the widgets
-        self.main_wnd.lines_table_widget.setRowCount(0)
-        self.main_wnd.lines_match_list_widget.clear()
+        # If the widgets are already showing the lines of this object (e.g.
+        # when restoring the state after a redrock run) there is no need to
+        # rebuild their content.
+        same_object = obj_uuid == self._last_restored_uuid
+        self._last_restored_uuid = obj_uuid
+
+        if not same_object:
+            # Clear current content of the widgets
+            self.main_wnd.lines_table_widget.setRowCount(0)
+            self.main_wnd.lines_match_list_widget.clear()
 
         # If object state has not been previously saved, then return
         if obj_uuid not in self.object_state_dict:
             self.global_state = GlobalState.READY
             return
 
-        # otherwise restore any old previously saved data
-        old_state = self.object_state_dict[obj_uuid]
-
-        lines = old_state['lines']['list']
-        self.main_wnd.lines_table_widget.setRowCount(len(lines))
-        for line_info in lines:
-            w_item = qt_api.QtWidgets.QTableWidgetItem(line_info['text'])
-            w_item.setData(
-                qt_api.QtCore.Qt.ItemDataRole.UserRole,
-                line_info['data']
-            )
-            w_item.setCheckState(line_info['checked'])
-            w_item.setFlags(
-                qt_api.QtCore.Qt.ItemFlag.ItemIsSelectable |
-                qt_api.QtCore.Qt.ItemFlag.ItemIsEnabled |
-                qt_api.QtCore.Qt.ItemFlag.ItemIsUserCheckable
-            )
-
-            r_item = qt_api.QtWidgets.QTableWidgetItem("")
-            r_item.setFlags(
-                qt_api.QtCore.Qt.ItemFlag.ItemIsSelectable |
-                qt_api.QtCore.Qt.ItemFlag.ItemIsEnabled
-            )
-            r_item.setData(qt_api.QtCore.Qt.ItemDataRole.UserRole, 0.0)
-
-            m_item = qt_api.QtWidgets.QTableWidgetItem("")
-            m_item.setFlags(
-                qt_api.QtCore.Qt.ItemFlag.ItemIsSelectable |
-                qt_api.QtCore.Qt.ItemFlag.ItemIsEnabled
-            )
-
-            self.main_wnd.lines_table_widget.setItem(
-                line_info['row'], 0, w_item
-            )
-
-            self.main_wnd.lines_table_widget.setItem(
-                line_info['row'], 1, r_item
-            )
-
-            self.main_wnd.lines_table_widget.setItem(
-                line_info['row'], 2, m_item
-            )
+        # otherwise restore any old previously saved data
+        old_state = self.object_state_dict[obj_uuid]
 
-        redshifts_form_lines = old_state['lines']['redshifts']
-        for z_info in redshifts_form_lines:
-            z_item = qt_api.QtWidgets.QListWidgetItem(z_info['text'])
-            z_item.setData(
-                qt_api.QtCore.Qt.ItemDataRole.UserRole,
-                z_info['data']
-            )
-            self.main_wnd.lines_match_list_widget.insertItem(
-                z_info['row'], z_item
-            )
+        if not same_object:
+            self._restore_lines_state(old_state)
 
         try:
             current_redshift = old_state['redshift']
         except KeyError:
             current_redshift = None
 
-        if current_redshift:
+        if not current_redshift:
+            current_redshift = 0
+
+        if self.main_wnd.z_dspinbox.value() != current_redshift:
             self.main_wnd.z_dspinbox.setValue(current_redshift)
-        else:
-            self.main_wnd.z_dspinbox.setValue(0)
 
         self.global_state = GlobalState.READY
 
@@ -1738,10 +2803,111 @@ class GuiApp:
         except KeyError:
             quality_flag = 0
 
-        self.main_wnd.qflag_combo_box.setCurrentIndex(quality_flag)
+        if self.main_wnd.qflag_combo_box.currentIndex() != quality_flag:
+            self.main_wnd.qflag_combo_box.setCurrentIndex(quality_flag)
 
         self._update_spec_item_qf(obj_uuid, quality_flag)
 
+    def _reset_chart_axes(
+        self,
+        chart_view: SpectrumQChartView,
+        log_y: bool
+    ) -> Tuple[QtCharts.QAbstractAxis, QtCharts.QAbstractAxis]:
+        """
+        Replace the axes of a chart with new ones fitted to its series.
+
+        :param chart_view: The view of the chart.
+        :param log_y: Whether the y axis should be logarithmic.
+        :return axis_x: The new x axis.
+        :return axis_y: The new y axis.
+        """
+        chart = chart_view.chart()
+        for ax in chart.axes():
+            chart.removeAxis(ax)
+
+        axis_x = qt_api.QtCharts.QValueAxis()
+        if log_y:
+            axis_y = qt_api.QtCharts.QLogValueAxis()
+        else:
+            axis_y = qt_api.QtCharts.QValueAxis()
+
+        chart.addAxis(axis_x, qt_api.QtCore.Qt.AlignmentFlag.AlignBottom)
+        chart.addAxis(axis_y, qt_api.QtCore.Qt.AlignmentFlag.AlignLeft)
+
+        # The range of the series domain is computed only when the series
+        # is added to the chart, so add the series again to fit the axes to
+        # their current points.
+        for series in chart.series():
+            chart.removeSeries(series)
+            chart.addSeries(series)
+            series.attachAxis(axis_x)
+            series.attachAxis(axis_y)
+
+        self._chart_axes[chart_view] = (axis_x, axis_y)
+        return axis_x, axis_y
+
+    def _restore_lines_state(self, old_state: Dict[str, Any]) -> None:
+        """
+        Fill the lines table and the redshift matches list.
+
+        :param old_state: The saved state of the object.
+        """
+        lines_table: QtWidgets.QTableWidget
+        lines_table = self.main_wnd.lines_table_widget
+
+        # Repaint the table only once, after all the rows have been filled
+        lines_table.setUpdatesEnabled(False)
+        try:
+            lines = old_state['lines']['list']
+            lines_table.setRowCount(len(lines))
+            for line_info in lines:
+                w_item = qt_api.QtWidgets.QTableWidgetItem(line_info['text'])
+                w_item.setData(
+                    qt_api.QtCore.Qt.ItemDataRole.UserRole,
+                    line_info['data']
+                )
+                w_item.setCheckState(line_info['checked'])
+                w_item.setFlags(
+                    qt_api.QtCore.Qt.ItemFlag.ItemIsSelectable |
+                    qt_api.QtCore.Qt.ItemFlag.ItemIsEnabled |
+                    qt_api.QtCore.Qt.ItemFlag.ItemIsUserCheckable
+                )
+
+                r_item = qt_api.QtWidgets.QTableWidgetItem("")
+                r_item.setFlags(
+                    qt_api.QtCore.Qt.ItemFlag.ItemIsSelectable |
+                    qt_api.QtCore.Qt.ItemFlag.ItemIsEnabled
+                )
+                r_item.setData(qt_api.QtCore.Qt.ItemDataRole.UserRole, 0.0)
+
+                m_item = qt_api.QtWidgets.QTableWidgetItem("")
+                m_item.setFlags(
+                    qt_api.QtCore.Qt.ItemFlag.ItemIsSelectable |
+                    qt_api.QtCore.Qt.ItemFlag.ItemIsEnabled
+                )
+
+                lines_table.setItem(line_info['row'], 0, w_item)
+                lines_table.setItem(line_info['row'], 1, r_item)
+                lines_table.setItem(line_info['row'], 2, m_item)
+        finally:
+            lines_table.setUpdatesEnabled(True)
+
+        z_list: QtWidgets.QListWidget
+        z_list = self.main_wnd.lines_match_list_widget
+
+        z_list.setUpdatesEnabled(False)
+        try:
+            redshifts_form_lines = old_state['lines']['redshifts']
+            for z_info in redshifts_form_lines:
+                z_item = qt_api.QtWidgets.QListWidgetItem(z_info['text'])
+                z_item.setData(
+                    qt_api.QtCore.Qt.ItemDataRole.UserRole,
+                    z_info['data']
+                )
+                z_list.insertItem(z_info['row'], z_item)
+        finally:
+            z_list.setUpdatesEnabled(True)
+
     def _show_update_message(self, new_version: Optional[str]) -> None:
         self.msgBox.setText(
             self.qapp.tr(
@@ -1771,6 +2937,202 @@ class GuiApp:
             qt_api.QtCharts.QChartView.RubberBand.RectangleRubberBand
         )
 
+    def _update_chart_series(
+        self,
+        key: str,
+        chart_view: SpectrumQChartView,
+        name: str,
+        x_values: np.ndarray,
+        y_values: Optional[np.ndarray]
+    ) -> Optional[QtCharts.QLineSeries]:
+        """
+        Update the points of one of the series drawn in the charts.
+
+        The series is created and added to the chart the first time, while
+        afterward only its points are replaced.
+
+        :param key: A unique name identifying the series.
+        :param chart_view: The view of the chart containing the series.
+        :param name: The name of the series.
+        :param x_values: x values of the points.
+        :param y_values: y values of the points. If None, the series is
+            emptied and hidden.
+        :return series: The series, or None if y_values is None.
+        """
+        chart = chart_view.chart()
+        series = self._chart_series.get(key, None)
+
+        if y_values is None:
+            if series is not None:
+                chart_view.setSeriesData(series, [], [])
+                series.setVisible(False)
+            return None
+
+        if series is None:
+            series = values2series(name)
+            chart_view.setSeriesData(series, x_values, y_values)
+            chart.addSeries(series)
+            for ax in self._chart_axes.get(chart_view, ()):
+                series.attachAxis(ax)
+            self._chart_series[key] = series
+        else:
+            chart_view.setSeriesData(series, x_values, y_values)
+            series.setVisible(True)
+
+        return series
+
+    def _update_smoothed_flux(self) -> None:
+        """
+        Update the smoothed flux of the current spectrum.
+
+        Only the flux series is touched, so this is all that is needed when
+        the smoothing settings change.
+        """
+        if self.global_state != GlobalState.READY:
+            return
+
+        spec_uuid = self.current_uuid
+        flux_series = self._chart_series.get('flux', None)
+        if spec_uuid is None or flux_series is None:
+            return
+
+        wav: np.ndarray
+        flux: np.ndarray
+        wav, flux = self._get_spectrum_arrays(spec_uuid)
+
+        use_opengl = self.settings_wnd.opengl_check_box.isChecked()
+        smoothing_enabled = self.main_wnd.smoothing_check_box.isChecked()
+
+        smoothed_flux: Union[np.ndarray, None] = None
+        if smoothing_enabled:
+            smoothing_factor = self.main_wnd.smoothing_dspinbox.value()
+
+            # The spin box has two decimals, round the factor so that the
+            # same value always hits the cache
+            cache_key = (spec_uuid, round(smoothing_factor, 2))
+            try:
+                smoothed_flux = self._smoothing_cache.pop(cache_key)
+                self._smoothing_cache[cache_key] = smoothed_flux
+            except KeyError:
+                # Smooth the flux in background, this method is called again
+                # when the smoothed flux is ready. In the meantime keep
+                # showing the old smoothed flux, unless it belongs to
+                # another spectrum.
+                if cache_key not in self._smoothing_pending:
+                    self._smoothing_pending.append(cache_key)
+                    smoothing_sigma = len(flux) / (1 + 2 * smoothing_factor)
+
+                    # The smoothed flux is only displayed, single precision
+                    # is enough and halves the memory used by the cache
+                    self._start_background_task(
+                        lambda result: self._smoothing_done(cache_key, result),
+                        lambda exc: self._smoothing_failed(cache_key, exc),
+                        utils.smooth_spectrum,
+                        wav, flux.astype(np.float32), sigma=smoothing_sigma
+                    )
+                if self._smoothed_flux_uuid == spec_uuid:
+                    return
+
+        # NOTE: OpenGL series do not support opacity, so the raw flux is drawn
+        #       by the software renderer when it is dimmed behind the
+        #       smoothed flux.
+        flux_series.setUseOpenGL(use_opengl and not smoothing_enabled)
+        flux_series.setOpacity(0.2 if smoothing_enabled else 1.0)
+
+        is_new_series = 'smoothed_flux' not in self._chart_series
+        smoothed_flux_series = self._update_chart_series(
+            'smoothed_flux', self.flux_chart_view,
+            self.qapp.tr("Smoothed flux"), wav, smoothed_flux
+        )
+        self._smoothed_flux_uuid = (
+            spec_uuid if smoothed_flux is not None else None
+        )
+
+        # The series is reused, so its pen needs to be set only once
+        if is_new_series and smoothed_flux_series is not None:
+            smoothed_flux_series.setPen(
+                qt_api.QtGui.QPen(qt_api.QtGui.QColor("orange"), 2)
+            )
+
+    def _smoothing_failed(
+        self,
+        cache_key: Tuple[uuid.UUID, float],
+        exc: Exception
+    ) -> None:
+        self._smoothing_pending.remove(cache_key)
+        self._background_task_failed(
+            self.qapp.tr("An error has occurred while smoothing the flux."),
+            exc,
+            unlock=False
+        )
+
+    def _smoothing_done(
+        self,
+        cache_key: Tuple[uuid.UUID, float],
+        smoothed_flux: np.ndarray
+    ) -> None:
+        self._smoothing_pending.remove(cache_key)
+
+        if len(self._smoothing_cache) >= self._smoothing_cache_size:
+            # Drop the least recently used entry
+            self._smoothing_cache.pop(next(iter(self._smoothing_cache)))
+        self._smoothing_cache[cache_key] = smoothed_flux
+
+        # Draw the smoothed flux only if it is still the one requested
+        if (
+            cache_key[0] == self.current_uuid and
+            self.main_wnd.smoothing_check_box.isChecked() and
+            round(self.main_wnd.smoothing_dspinbox.value(), 2) == cache_key[1]
+        ):
+            self._update_smoothed_flux()
+
+    def _start_background_task(
+        self,
+        on_finished: Callable[[Any], None],
+        on_failed: Callable[[Exception], None],
+        func: Callable,
+        *args: Any,
+        **kwargs: Any
+    ) -> None:
+        """
+        Run a function in a thread of the global QThreadPool.
+
+        :param on_finished: Called in the GUI thread with the result of the
+            function.
+        :param on_failed: Called in the GUI thread with the exception raised
+            by the function.
+        :param func: The function.
+        :param args: Positional arguments passed to the function.
+        :param kwargs: Keyword arguments passed to the function.
+        """
+        task = QBackgroundTask(func, *args, **kwargs)
+
+        def _release(*args: Any) -> None:
+            self._background_tasks.remove(task)
+
+        task.signals.finished.connect(on_finished)
+        task.signals.failed.connect(on_failed)
+        task.signals.finished.connect(_release)
+        task.signals.failed.connect(_release)
+        self._background_tasks.append(task)
+        qt_api.QtCore.QThreadPool.globalInstance().start(task)
+
+    def _update_lines_cache_row(
+        self,
+        row_index: int,
+        item: QtWidgets.QTableWidgetItem
+    ) -> None:
+        assert self._line_lams is not None
+        assert self._line_checked is not None
+        try:
+            lam = float(item.data(qt_api.QtCore.Qt.ItemDataRole.UserRole))
+        except (TypeError, ValueError):
+            lam = np.nan
+        self._line_lams[row_index] = lam
+        self._line_checked[row_index] = np.isfinite(lam) and (
+            item.checkState() == qt_api.QtCore.Qt.CheckState.Checked
+        )
+
     def _update_spec_item_qf(self, item_uuid: uuid.UUID, qf: int) -> None:
         item: QtWidgets.QListWidgetItem
         item = self.open_spectra_items[item_uuid]
@@ -1780,7 +3142,15 @@ class GuiApp:
         self._updateMouseLabel(args[0][0])
 
     def _updateMouseLabel(self, mouse_pos: QtCore.QPointF) -> None:
-        self.mousePosLabel.setText(f"\u03BB = {mouse_pos.x():.2f}")
+        self._mouse_label_lambda = mouse_pos.x()
+        if not self._mouse_label_timer.isActive():
+            self._mouse_label_timer.start()
+
+    def _flush_mouse_label(self) -> None:
+        if self._mouse_label_lambda is not None:
+            self.mousePosLabel.setText(
+                f"\u03BB = {self._mouse_label_lambda:.2f}"
+            )
 
     def acceptSettings(self, *args, **kwargs) -> None:
         self.saveSettings()
@@ -1927,46 +3297,37 @@ class GuiApp:
             qt_api.QtCore.Qt.ItemDataRole.UserRole
         )
 
-        self.showObjectInfo(spec_uuid)
-
-        flux_chart = self.flux_chart_view.chart()
-        flux_chart.removeAllSeries()
+        use_opengl = self.settings_wnd.opengl_check_box.isChecked()
+        log_y = self.main_wnd.log_y_check_box.isChecked()
 
-        var_chart = self.var_chart_view.chart()
-        var_chart.removeAllSeries()
+        draw_state = (spec_uuid, use_opengl, log_y)
+        if draw_state == self._last_draw_state:
+            return
 
-        wd_chart = self.wdisp_chart_view.chart()
-        wd_chart.removeAllSeries()
+        # The spectra not kept in memory are read again from their files,
+        # that may have been moved or deleted since they were imported
+        sp: Optional[Spectrum1D] = self._read_spectrum(spec_uuid)
+        if sp is None:
+            return
 
-        sky_chart = self.sky_chart_view.chart()
-        sky_chart.removeAllSeries()
+        self.showObjectInfo(spec_uuid)
 
         self._backup_current_object_state()
-        if spec_uuid != self.current_uuid:
+        spectrum_changed = spec_uuid != self.current_uuid
+        if spectrum_changed:
             # If we actually change the spectrum, then reset the view
             self.current_uuid = spec_uuid
             self._restore_object_state(spec_uuid)
 
-            for ax in flux_chart.axes():
-                flux_chart.removeAxis(ax)
-
-        for ax in var_chart.axes():
-            var_chart.removeAxis(ax)
-        for ax in wd_chart.axes():
-            wd_chart.removeAxis(ax)
-        for ax in sky_chart.axes():
-            sky_chart.removeAxis(ax)
-
-        sp: Spectrum1D = self.open_spectra[spec_uuid]
-
-        wav: np.ndarray = sp.spectral_axis.value
+        wav: np.ndarray
+        flux: np.ndarray
+        wav, flux = self._get_spectrum_arrays(spec_uuid)
         wav_unit: units.Unit = sp.spectral_axis.unit
-
-        flux: np.ndarray = sp.flux.value
         flux_unit: units.Unit = sp.flux.unit
 
-        var: Union[np.ndarray, None] = None
-        var_unit: Union[units.Unit, None] = None
+        var: Union[np.ndarray, None]
+        var_unit: Union[units.Unit, None]
+        var, var_unit = self._get_spectrum_variance(spec_uuid)
 
         wdisp: Union[np.ndarray, None] = None
         wdisp_unit: Union[units.Unit, None] = None
@@ -1974,16 +3335,6 @@ class GuiApp:
         sky: Union[np.ndarray, None] = None
         sky_unit: Union[units.Unit, None] = None
 
-        if isinstance(sp.uncertainty, VarianceUncertainty):
-            var = sp.uncertainty.array
-            var_unit = sp.uncertainty.unit
-        elif isinstance(sp.uncertainty, InverseVariance):
-            var = 1 / sp.uncertainty.array
-            var_unit = 1 / sp.uncertainty.unit
-        elif isinstance(sp.uncertainty, StdDevUncertainty):
-            var = sp.uncertainty.array ** 2
-            var_unit = sp.uncertainty.unit ** 2
-
         try:
             wd_data = sp.wd  # type: ignore
         except AttributeError:
@@ -2002,116 +3353,72 @@ class GuiApp:
                 sky = sky_data.value
                 sky_unit = sky_data.unit
 
-        flux_series = values2series(wav, flux, self.qapp.tr("Flux"))
-        flux_chart.addSeries(flux_series)
-
-        if not flux_chart.axes():
-            flux_axis_x = qt_api.QtCharts.QValueAxis()
-            flux_axis_y = qt_api.QtCharts.QValueAxis()
-
-            flux_chart.addAxis(
-                flux_axis_x, qt_api.QtCore.Qt.AlignmentFlag.AlignBottom
-            )
-            flux_chart.addAxis(
-                flux_axis_y, qt_api.QtCore.Qt.AlignmentFlag.AlignLeft
-            )
-        else:
-            flux_axis_x = flux_chart.axes()[0]
-            flux_axis_y = flux_chart.axes()[1]
-
-        if not var_chart.axes():
-            var_axis_x = qt_api.QtCharts.QValueAxis()
-
-            if self.main_wnd.log_y_check_box.isChecked():
-                var_axis_y = qt_api.QtCharts.QLogValueAxis()
-            else:
-                var_axis_y = qt_api.QtCharts.QValueAxis()
-
-            var_chart.addAxis(
-                var_axis_x, qt_api.QtCore.Qt.AlignmentFlag.AlignBottom
-            )
-            var_chart.addAxis(
-                var_axis_y, qt_api.QtCore.Qt.AlignmentFlag.AlignLeft
-            )
-        else:
-            var_axis_x = var_chart.axes()[0]
-            var_axis_y = var_chart.axes()[1]
-
-        if not wd_chart.axes():
-            wd_axis_x = qt_api.QtCharts.QValueAxis()
+        # The series are created only once and then their points are updated
+        # in place, so that the charts do not need to be rebuilt
+        self._update_chart_series(
+            'flux', self.flux_chart_view, self.qapp.tr("Flux"), wav, flux
+        )
+        self._update_smoothed_flux()
 
-            if self.main_wnd.log_y_check_box.isChecked():
-                wd_axis_y = qt_api.QtCharts.QLogValueAxis()
-            else:
-                wd_axis_y = qt_api.QtCharts.QValueAxis()
+        var_series = self._update_chart_series(
+            'var', self.var_chart_view, self.qapp.tr("Variance"), wav, var
+        )
+        if var_series is not None:
+            var_series.setUseOpenGL(use_opengl)
 
-            wd_chart.addAxis(
-                wd_axis_x, qt_api.QtCore.Qt.AlignmentFlag.AlignBottom
-            )
-            wd_chart.addAxis(
-                wd_axis_y, qt_api.QtCore.Qt.AlignmentFlag.AlignLeft
-            )
-        else:
-            wd_axis_x = wd_chart.axes()[0]
-            wd_axis_y = wd_chart.axes()[1]
+        self._update_chart_series(
+            'wdisp', self.wdisp_chart_view, self.qapp.tr("Reso. curve"),
+            wav, wdisp
+        )
 
-        if not sky_chart.axes():
-            sky_axis_x = qt_api.QtCharts.QValueAxis()
+        self._update_chart_series(
+            'sky', self.sky_chart_view, self.qapp.tr("Sky"), wav, sky
+        )
 
-            if self.main_wnd.log_y_check_box.isChecked():
-                sky_axis_y = qt_api.QtCharts.QLogValueAxis()
-            else:
-                sky_axis_y = qt_api.QtCharts.QValueAxis()
+        # The axes are replaced only when the spectrum changes, so that the
+        # current zoom is kept when redrawing the same spectrum. New axes are
+        # automatically fitted to the data of the series.
+        flux_axis_x, flux_axis_y = self._get_chart_axes(
+            self.flux_chart_view, log_y=False, reset=spectrum_changed
+        )
+        var_axis_x, var_axis_y = self._get_chart_axes(
+            self.var_chart_view, log_y, reset=spectrum_changed
+        )
+        wd_axis_x, wd_axis_y = self._get_chart_axes(
+            self.wdisp_chart_view, log_y, reset=spectrum_changed
+        )
+        sky_axis_x, sky_axis_y = self._get_chart_axes(
+            self.sky_chart_view, log_y, reset=spectrum_changed
+        )
 
-            sky_chart.addAxis(
-                sky_axis_x, qt_api.QtCore.Qt.AlignmentFlag.AlignBottom
-            )
-            sky_chart.addAxis(
-                sky_axis_y, qt_api.QtCore.Qt.AlignmentFlag.AlignLeft
-            )
-        else:
-            sky_axis_x = sky_chart.axes()[0]
-            sky_axis_y = sky_chart.axes()[1]
+        # Formatting astropy units is not cheap, do it once per spectrum
+        try:
+            unit_str = self._unit_str_cache[spec_uuid]
+        except KeyError:
+            unit_str = {
+                'wav': str(wav_unit),
+                'flux': str(flux_unit),
+                'var': str(var_unit),
+                'wdisp': str(wdisp_unit),
+                'sky': str(sky_unit),
+            }
+            self._unit_str_cache[spec_uuid] = unit_str
 
         flux_axis_x.setTickInterval(500)
         flux_axis_x.setLabelFormat("%.2f")
-        flux_axis_x.setTitleText(str(wav_unit))
+        set_axis_title(flux_axis_x, unit_str['wav'])
 
         flux_axis_y.setLabelFormat("%.2f")
-        flux_axis_y.setTitleText(str(flux_unit))
-
-        flux_series.attachAxis(flux_axis_x)
-        flux_series.attachAxis(flux_axis_y)
-
-        if self.main_wnd.smoothing_check_box.isChecked():
-            smoothing_factor = self.main_wnd.smoothing_dspinbox.value()
-
-            flux_series.setOpacity(0.2)
-            smoothing_sigma = len(flux) / (1 + 2 * smoothing_factor)
-            smoothed_flux = utils.smooth_fft(flux, sigma=smoothing_sigma)
-            smoothed_flux_series = values2series(
-                wav, smoothed_flux, self.qapp.tr("Smoothed flux")
-            )
-
-            pen: QtGui.QPen = smoothed_flux_series.pen()
-            pen.setColor(qt_api.QtGui.QColor("orange"))
-            pen.setWidth(2)
-            smoothed_flux_series.setPen(pen)
-
-            flux_chart.addSeries(smoothed_flux_series)
-            smoothed_flux_series.attachAxis(flux_axis_x)
-            smoothed_flux_series.attachAxis(flux_axis_y)
+        set_axis_title(flux_axis_y, unit_str['flux'])
 
         if var is None:
             self.main_wnd.container_tab_var.setEnabled(False)
         else:
             self.main_wnd.container_tab_var.setEnabled(True)
-            var_series = values2series(wav, var, self.qapp.tr("Variance"))
-            var_chart.addSeries(var_series)
 
             var_axis_x.setTickInterval(500)
             var_axis_x.setLabelFormat("%.2f")
-            var_axis_x.setTitleText(str(wav_unit))
+            set_axis_title(var_axis_x, unit_str['wav'])
 
             if isinstance(var_axis_y, qt_api.QtCharts.QLogValueAxis):
                 var_axis_y.setBase(10.0)
@@ -2119,69 +3426,42 @@ class GuiApp:
                 var_axis_y.setTickCount(10)
 
             var_axis_y.setLabelFormat("%.2f")
-            var_axis_y.setTitleText(str(var_unit))
-
-            var_series.attachAxis(var_axis_x)
-            var_series.attachAxis(var_axis_y)
+            set_axis_title(var_axis_y, unit_str['var'])
 
         if wdisp is None:
             self.main_wnd.container_tab_wd.setEnabled(False)
         else:
             self.main_wnd.container_tab_wd.setEnabled(True)
-            wd_series = values2series(wav, wdisp, self.qapp.tr("Reso. curve"))
-            wd_chart.addSeries(wd_series)
 
             wd_axis_x.setTickInterval(500)
             wd_axis_x.setLabelFormat("%.2f")
-            wd_axis_x.setTitleText(str(wav_unit))
+            set_axis_title(wd_axis_x, unit_str['wav'])
 
-            if not isinstance(wd_axis_y, qt_api.QtCharts.QLogValueAxis):
+            if isinstance(wd_axis_y, qt_api.QtCharts.QLogValueAxis):
                 wd_axis_y.setBase(10.0)
             else:
                 wd_axis_y.setTickCount(10)
             wd_axis_y.setLabelFormat("%.2f")
-            wd_axis_y.setTitleText(str(wdisp_unit))
-
-            wd_series.attachAxis(wd_axis_x)
-            wd_series.attachAxis(wd_axis_y)
+            set_axis_title(wd_axis_y, unit_str['wdisp'])
 
         if sky is None:
             self.main_wnd.container_tab_sky.setEnabled(False)
         else:
             self.main_wnd.container_tab_sky.setEnabled(True)
-            sky_series = values2series(wav, sky, self.qapp.tr("Sky"))
-            sky_chart.addSeries(sky_series)
 
             sky_axis_x.setTickInterval(500)
             sky_axis_x.setLabelFormat("%.2f")
-            sky_axis_x.setTitleText(str(wav_unit))
+            set_axis_title(sky_axis_x, unit_str['wav'])
 
-            if not isinstance(sky_axis_y, qt_api.QtCharts.QLogValueAxis):
+            if isinstance(sky_axis_y, qt_api.QtCharts.QLogValueAxis):
                 sky_axis_y.setBase(10.0)
             else:
                 sky_axis_y.setTickCount(10)
 
             sky_axis_y.setLabelFormat("%.2f")
-            sky_axis_y.setTitleText(str(sky_unit))
-
-            sky_series.attachAxis(sky_axis_x)
-            sky_series.attachAxis(sky_axis_y)
+            set_axis_title(sky_axis_y, unit_str['sky'])
 
-        flux_chart.setContentsMargins(0, 0, 0, 0)
-        flux_chart.setBackgroundRoundness(0)
-        flux_chart.legend().hide()
-
-        var_chart.setContentsMargins(0, 0, 0, 0)
-        var_chart.setBackgroundRoundness(0)
-        var_chart.legend().hide()
-
-        wd_chart.setContentsMargins(0, 0, 0, 0)
-        wd_chart.setBackgroundRoundness(0)
-        wd_chart.legend().hide()
-
-        sky_chart.setContentsMargins(0, 0, 0, 0)
-        sky_chart.setBackgroundRoundness(0)
-        sky_chart.legend().hide()
+        self._last_draw_state = draw_state
 
     def doAddNewLine(self, *args: Any, **kwargs: Any) -> None:
         """Tell the main app to identify a new line."""
@@ -2321,39 +3601,59 @@ class GuiApp:
         if self.current_uuid is None:
             return
 
-        sp: Spectrum1D = self.open_spectra[self.current_uuid]
-
-        wav: np.ndarray = sp.spectral_axis.value
-        flux: np.ndarray = sp.flux.value
-        var: np.ndarray | None = None
+        wav: np.ndarray
+        flux: np.ndarray
+        wav, flux = self._get_spectrum_arrays(self.current_uuid)
 
-        if isinstance(sp.uncertainty, VarianceUncertainty):
-            var = sp.uncertainty.array
-        if isinstance(sp.uncertainty, InverseVariance):
-            var = 1 / sp.uncertainty.array
-        elif isinstance(sp.uncertainty, StdDevUncertainty):
-            var = sp.uncertainty.array ** 2
+        var: Union[np.ndarray, None]
+        var, _ = self._get_spectrum_variance(self.current_uuid)
 
-        my_lines: List[
-            Tuple[int, float, float, float]
-        ] = lines.get_spectrum_lines(
-            wavelengths=wav,
-            flux=flux,
-            var=var
+        # The search can take a while, so run it in background and prevent
+        # the user from changing the current object in the meantime
+        spec_uuid = self.current_uuid
+        self._lock()
+        self.qapp.setOverrideCursor(qt_api.QtCore.Qt.CursorShape.WaitCursor)
+        self._start_background_task(
+            lambda res: self._identify_lines_done(spec_uuid, res),
+            lambda exc: self._background_task_failed(
+                self.qapp.tr("An error has occurred while identifying lines."),
+                exc
+            ),
+            lines.get_spectrum_lines,
+            wavelengths=wav, flux=flux, var=var
         )
 
-        self.main_wnd.lines_table_widget.setRowCount(0)
-        self.main_wnd.lines_table_widget.setRowCount(len(my_lines))
-        for j, (k, w, l, h) in enumerate(my_lines):
-            new_item = qt_api.QtWidgets.QTableWidgetItem(f"{w:.2f} A")
-            new_item.setFlags(
-                qt_api.QtCore.Qt.ItemFlag.ItemIsSelectable |
-                qt_api.QtCore.Qt.ItemFlag.ItemIsEnabled |
-                qt_api.QtCore.Qt.ItemFlag.ItemIsUserCheckable
-            )
-            new_item.setData(qt_api.QtCore.Qt.ItemDataRole.UserRole, w)
-            new_item.setCheckState(qt_api.QtCore.Qt.CheckState.Checked)
-            self.main_wnd.lines_table_widget.setItem(j, 0, new_item)
+    def _identify_lines_done(
+        self,
+        spec_uuid: uuid.UUID,
+        my_lines: List[Tuple[int, float, float, float]]
+    ) -> None:
+        self.qapp.restoreOverrideCursor()
+        self._unlock()
+
+        if spec_uuid != self.current_uuid:
+            return
+
+        lines_table: QtWidgets.QTableWidget
+        lines_table = self.main_wnd.lines_table_widget
+
+        # Repaint the table only once, after all the rows have been filled
+        lines_table.setUpdatesEnabled(False)
+        try:
+            lines_table.setRowCount(0)
+            lines_table.setRowCount(len(my_lines))
+            for j, (k, w, l, h) in enumerate(my_lines):
+                new_item = qt_api.QtWidgets.QTableWidgetItem(f"{w:.2f} A")
+                new_item.setFlags(
+                    qt_api.QtCore.Qt.ItemFlag.ItemIsSelectable |
+                    qt_api.QtCore.Qt.ItemFlag.ItemIsEnabled |
+                    qt_api.QtCore.Qt.ItemFlag.ItemIsUserCheckable
+                )
+                new_item.setData(qt_api.QtCore.Qt.ItemDataRole.UserRole, w)
+                new_item.setCheckState(qt_api.QtCore.Qt.CheckState.Checked)
+                lines_table.setItem(j, 0, new_item)
+        finally:
+            lines_table.setUpdatesEnabled(True)
 
     def doImportZcat(self, *args, **kwargs) -> None:
         """
@@ -2497,8 +3797,8 @@ class GuiApp:
                 }
             }
 
-            self.open_spectra[item_uuid] = sp
             self.open_spectra_files[item_uuid] = os.path.abspath(file)
+            self.open_spectra[item_uuid] = sp
             self.open_spectra_items[item_uuid] = new_item
             self.object_state_dict[item_uuid] = info_dict
             self.main_wnd.spec_list_widget.addItem(new_item)
@@ -2586,48 +3886,86 @@ class GuiApp:
 
     def doRedshiftFromLines(self, *args: Any, **kwargs: Any) -> None:
         """Compute the redshift by matching identified lines."""
-        line_table: QtWidgets.QTableWidget
-        line_table = self.main_wnd.lines_table_widget
-
-        z_list: QtWidgets.QListWidget
-        z_list = self.main_wnd.lines_match_list_widget
-
         tol: float = self.main_wnd.lines_tol_dspinbox.value()
         z_min: float = self.main_wnd.z_min_dspinbox.value()
         z_max: float = self.main_wnd.z_max_dspinbox.value()
 
         # Build a list of selected lines to be used.
         # If no lines are selected, then use all lines.
-        lines_lam = []
-        for row_index in range(line_table.rowCount()):
-            item = line_table.item(row_index, 0)
-            if item is None:
-                continue
-            elif item.checkState() != qt_api.QtCore.Qt.CheckState.Checked:
-                # Ignore lines that are not selected
-                continue
+        lines_lam = self._get_checked_lines_lam()
 
-            lines_lam.append(
-                float(item.data(qt_api.QtCore.Qt.ItemDataRole.UserRole))
-            )
-
-        res = lines.get_redshift_from_lines(
+        # The search can take a while, so run it in background and prevent
+        # the user from changing the current object in the meantime
+        self._lock()
+        self.qapp.setOverrideCursor(qt_api.QtCore.Qt.CursorShape.WaitCursor)
+        self._start_background_task(
+            self._redshift_from_lines_done,
+            lambda exc: self._background_task_failed(
+                self.qapp.tr(
+                    "An error has occurred while computing the redshift."
+                ),
+                exc
+            ),
+            lines.get_redshift_from_lines,
             lines_lam, z_min=z_min, z_max=z_max, tol=tol
         )
 
+    def _redshift_from_lines_done(
+        self,
+        res: Union[None, Tuple[np.ndarray, np.ndarray]]
+    ) -> None:
+        self.qapp.restoreOverrideCursor()
+        self._unlock()
+
         if res is None:
             return
 
-        z_list.clear()
-        for z, prob in zip(res[0], res[1]):
-            new_z_item = qt_api.QtWidgets.QListWidgetItem(
-                f"z={z:.4f} (p={prob:.4f})"
-            )
-            new_z_item.setData(
-                qt_api.QtCore.Qt.ItemDataRole.UserRole,
-                (z, prob)
-            )
-            z_list.addItem(new_z_item)
+        z_list: QtWidgets.QListWidget
+        z_list = self.main_wnd.lines_match_list_widget
+
+        # Repaint the list only once, after all the items have been added
+        z_list.setUpdatesEnabled(False)
+        try:
+            z_list.clear()
+            for z, prob in zip(res[0], res[1]):
+                new_z_item = qt_api.QtWidgets.QListWidgetItem(
+                    f"z={z:.4f} (p={prob:.4f})"
+                )
+                new_z_item.setData(
+                    qt_api.QtCore.Qt.ItemDataRole.UserRole,
+                    (z, prob)
+                )
+                z_list.addItem(new_z_item)
+        finally:
+            z_list.setUpdatesEnabled(True)
+
+    def _background_task_failed(
+        self,
+        message: str,
+        exc: Exception,
+        unlock: bool = True
+    ) -> None:
+        """
+        Report the failure of a background task.
+
+        :param message: The error message.
+        :param exc: The exception raised by the task.
+        :param unlock: Whether the task was started with a locked interface
+            and a wait cursor, that are restored. The default is True.
+        """
+        if unlock:
+            self.qapp.restoreOverrideCursor()
+            self._unlock()
+
+        self.msgBox.setWindowTitle(self.qapp.tr("Error"))
+        self.msgBox.setText(message)
+        self.msgBox.setInformativeText('')
+        self.msgBox.setDetailedText(str(exc))
+        self.msgBox.setIcon(qt_api.QtWidgets.QMessageBox.Icon.Critical)
+        self.msgBox.setStandardButtons(
+            qt_api.QtWidgets.QMessageBox.StandardButton.Ok
+        )
+        self.msgBox.exec()
 
     def doRemoveCurrentSpecItems(self) -> None:
         if self.main_wnd.spec_list_widget.count() == 0:
@@ -2641,7 +3979,7 @@ class GuiApp:
         item_uuid = item.data(qt_api.QtCore.Qt.ItemDataRole.UserRole)
         self.main_wnd.spec_list_widget.takeItem(current_row)
         self.open_spectra_items.pop(item_uuid)
-        self.open_spectra_files.pop(item_uuid)
+        del self.open_spectra[item_uuid]
 
         try:
             self.object_state_dict.pop(item_uuid)
@@ -2668,7 +4006,7 @@ class GuiApp:
             item_uuid = item.data(qt_api.QtCore.Qt.ItemDataRole.UserRole)
             self.main_wnd.spec_list_widget.takeItem(row - 1)
             self.open_spectra_items.pop(item_uuid)
-            self.open_spectra_files.pop(item_uuid)
+            del self.open_spectra[item_uuid]
 
             try:
                 self.object_state_dict.pop(item_uuid)
@@ -2751,8 +4089,10 @@ class GuiApp:
         self.main_wnd.redrock_text_edit.clear()
         self.statusbar.showMessage("Running redrock backend...")
 
-        for_rr: Dict[uuid.UUID, Spectrum1D] = {}
+        selected: Dict[uuid.UUID, Spectrum1D] = {}
+        for_rr: Mapping[uuid.UUID, Spectrum1D] = selected
         if self.main_wnd.redrock_all_radio.isChecked():
+            # The spectra are read from their files one at a time if needed
             for_rr = self.open_spectra
         elif self.main_wnd.redrock_selected_radio.isChecked():
 
@@ -2768,11 +4108,17 @@ class GuiApp:
                     item_uuid = item.data(
                         qt_api.QtCore.Qt.ItemDataRole.UserRole
                     )
-                    for_rr[item_uuid] = self.open_spectra[item_uuid]
+                    sp = self._read_spectrum(item_uuid)
+                    if sp is None:
+                        return
+                    selected[item_uuid] = sp
         else:
             if self.current_uuid is None:
                 return
-            for_rr[self.current_uuid] = self.open_spectra[self.current_uuid]
+            sp = self._read_spectrum(self.current_uuid)
+            if sp is None:
+                return
+            selected[self.current_uuid] = sp
 
         self.redrock_handler.run_redrock(for_rr)
 
@@ -2965,6 +4311,17 @@ class GuiApp:
                     continue
         self.loadIcons()
 
+        # Like the OpenGL series, the OpenGL viewport is used only if the
+        # user enabled it and a context can actually be created
+        use_opengl = self.settings_wnd.opengl_check_box.isChecked()
+        for chart_view in (
+            self.flux_chart_view,
+            self.var_chart_view,
+            self.wdisp_chart_view,
+            self.sky_chart_view
+        ):
+            chart_view.setOpenGLViewport(use_opengl and has_opengl())
+
     def mousePressedFlux(self, args) -> None:
         """Handle mouse button pressed events."""
         data_pos: QtCore.QPointF = args[0]
@@ -2977,9 +4334,17 @@ class GuiApp:
 
     def newProject(self) -> None:
         self.open_spectra_files = {}
-        self.open_spectra = {}
+        self.open_spectra = SpectraCache(
+            self.open_spectra_files, on_evict=self._forget_spectrum_arrays
+        )
         self.object_state_dict = {}
         self.current_uuid = None
+        self._last_restored_uuid = None
+        self._smoothing_cache = {}
+        self._smoothed_flux_uuid = None
+        self._variance_cache = {}
+        self._spectral_arrays = {}
+        self._unit_str_cache = {}
         self.current_project_file_path = None
         self.current_open_dir = None
 
@@ -2988,15 +4353,7 @@ class GuiApp:
         self.main_wnd.lines_table_widget.setRowCount(0)
         self.main_wnd.obj_prop_table_widget.setRowCount(0)
 
-        flux_chart = self.flux_chart_view.chart()
-        flux_chart.removeAllSeries()
-        for ax in flux_chart.axes():
-            flux_chart.removeAxis(ax)
-
-        var_chart = self.var_chart_view.chart()
-        var_chart.removeAllSeries()
-        for ax in var_chart.axes():
-            var_chart.removeAxis(ax)
+        self._clear_charts()
 
         self._lock()
         self.global_state = GlobalState.READY
@@ -3006,8 +4363,7 @@ class GuiApp:
 
     def openProject(self, file_name: str) -> None:
         """Load the project from a file."""
-        with open(file_name, 'r') as f:
-            serialized_dict: Dict[str, Any] = json.load(f)
+        serialized_dict: Dict[str, Any] = utils.load_json(file_name)
 
         self._lock()
         self.global_state = GlobalState.WAITING
@@ -3070,8 +4426,8 @@ class GuiApp:
                 current_spec_list_item = new_item
 
             self.main_wnd.spec_list_widget.addItem(new_item)
-            self.open_spectra[item_uuid] = sp
             self.open_spectra_files[item_uuid] = file_path
+            self.open_spectra[item_uuid] = sp
             self.open_spectra_items[item_uuid] = new_item
             self.main_wnd.spec_list_widget.insertItem(item_row, new_item)
             self.qapp.processEvents()
@@ -3252,8 +4608,7 @@ class GuiApp:
             'objects_properties': serialized_object_info_dict
         }
 
-        with open(file_name, 'w') as f:
-            json.dump(project_dict, f, indent=2)
+        utils.dump_json(project_dict, file_name)
 
     def saveSettings(self) -> None:
         for key, (get_func, _, _) in self._global_setting.items():
@@ -3337,7 +4692,7 @@ class GuiApp:
             self.flux_chart_view.setLinesType('A')
 
     def setSmoothingFactor(self, smoothing_value: float) -> None:
-        self.redrawCurrentSpec()
+        self._smoothing_timer.start()
 
     def showObjectInfo(self, object_uuid: uuid.UUID) -> None:
         sp: Spectrum1D = self.open_spectra[object_uuid]
@@ -3417,7 +4772,7 @@ class GuiApp:
                 other_item.setCheckState(ref_check_state)
 
     def toggleSmothing(self, show_smoothing: int) -> None:
-        self.redrawCurrentSpec()
+        self._smoothing_timer.start()
 
     def run(self) -> None:
         """Run the main Qt Application."""
@@ -3425,28 +4780,153 @@ class GuiApp:
         sys.exit(self.qapp.exec())
 
 
-def values2series(
-    x_values: Union[List[float], np.ndarray],
-    y_values: Union[List[float], np.ndarray],
-    name: str
-) -> qt_api.QtCharts.QLineSeries:
+@lru_cache(maxsize=1)
+def has_opengl() -> bool:
     """
-    Convert point values to a QLineSeries object.
+    Check if OpenGL can be used to draw the charts.
+
+    :return has_gl: True if a QOpenGLWidget is available and an OpenGL
+        context can be created, False otherwise.
+    """
+    if qt_api.QOpenGLWidget is None:
+        return False
+    return bool(qt_api.QtGui.QOpenGLContext().create())
+
+
+def get_line_color_key(line_type: str) -> str:
+    """
+    Get the key of the color used to draw a line of a given type.
+
+    :param line_type: The type of the line, see lines.get_lines().
+    :return color_key: Either 'both', 'absorption', 'emission' or 'unknown',
+        see SpectrumQChartView.line_colors.
+    """
+    if ('AE' in line_type) or ('EA' in line_type):
+        return "both"
+    elif 'A' in line_type:
+        return "absorption"
+    elif 'E' in line_type:
+        return "emission"
+    return "unknown"
+
+
+@lru_cache(maxsize=512)
+def get_known_lines(
+    line_type: Optional[str],
+    redshift: float
+) -> Tuple[Tuple[float, str, str], ...]:
+    """
+    Get the known lines of a given type shifted to a given redshift.
+
+    The lines are cached, since the same redshifts are requested again and
+    again while the user is adjusting the redshift, and by all the views
+    that show the lines.
+
+    :param line_type: The type of the lines, see lines.get_lines().
+    :param redshift: The redshift.
+    :return known_lines: The lines, as (wavelength, name, type) tuples.
+    """
+    return tuple(lines.get_lines(line_type=line_type, z=redshift))
+
+
+def values2series(name: str) -> qt_api.QtCharts.QLineSeries:
+    """
+    Create an empty QLineSeries object.
+
+    The points are set afterwards with replace_series_points(), that fills
+    the whole series in a single call.
 
-    :param x_values: x values of the points.
-    :param y_values: y values of the points.
     :param name: The name of the series.
     :return series: The series object.
     """
     series: QtCharts.QLineSeries = qt_api.QtCharts.QLineSeries()
     series.setName(name)
-    series.setUseOpenGL(False)  # issues with transparency when set to True!
-    for x, y in zip(x_values, y_values):
-        series.append(x, y)
-
+    series.setUseOpenGL(False)
     return series
 
 
+def set_axis_title(axis: QtCharts.QAbstractAxis, title: str) -> None:
+    """
+    Set the title of an axis, unless it already has the same title.
+
+    Changing the title of an axis triggers a new layout of the whole chart.
+
+    :param axis: The axis.
+    :param title: The new title.
+    """
+    if axis.titleText() != title:
+        axis.setTitleText(title)
+
+
+def values2polygon(
+    x_values: Union[List[float], np.ndarray],
+    y_values: Union[List[float], np.ndarray]
+) -> Optional[QtGui.QPolygonF]:
+    """
+    Convert point values to a QPolygonF object.
+
+    The coordinates are copied directly into the memory of the polygon,
+    without creating a QPointF object for each point.
+
+    :param x_values: x values of the points.
+    :param y_values: y values of the points.
+    :return polygon: The polygon, or None if the memory of the polygon
+        cannot be accessed with the Qt binding in use.
+    """
+    n_points = len(x_values)
+    try:
+        polygon: QtGui.QPolygonF = qt_api.QtGui.QPolygonF(n_points)
+        ptr = polygon.data()
+    except (TypeError, AttributeError):
+        return None
+
+    # PyQt exposes the memory of the polygon as a sip.voidptr
+    if not hasattr(ptr, 'setsize'):
+        return None
+    ptr.setsize(n_points * 2 * np.dtype(np.float64).itemsize)
+
+    buffer = np.frombuffer(ptr, dtype=np.float64).reshape(n_points, 2)
+    buffer[:, 0] = x_values
+    buffer[:, 1] = y_values
+    return polygon
+
+
+def replace_series_points(
+    series: QtCharts.QXYSeries,
+    x_values: Union[List[float], np.ndarray],
+    y_values: Union[List[float], np.ndarray]
+) -> None:
+    """
+    Replace all the points of a series at once.
+
+    Unlike clearing the series and appending the points one by one, this
+    notifies the chart only once and is the preferred way of changing the
+    points of a series already added to a chart.
+
+    :param series: The series.
+    :param x_values: x values of the new points.
+    :param y_values: y values of the new points.
+    """
+    if hasattr(series, 'replaceNp'):
+        series.replaceNp(
+            np.ascontiguousarray(x_values, dtype=np.float64),
+            np.ascontiguousarray(y_values, dtype=np.float64)
+        )
+        return
+
+    polygon = values2polygon(x_values, y_values)
+    if polygon is not None:
+        series.replace(polygon)
+    else:
+        series.replace([
+            qt_api.QtCore.QPointF(x, y)
+            for x, y in zip(
+                np.asarray(x_values, dtype=np.float64).tolist(),
+                np.asarray(y_values, dtype=np.float64).tolist()
+            )
+        ])
+
+
 def main() -> None:
     """Run the main GUI application using PySide."""
     myapp: GuiApp = GuiApp()
@@ -2,7 +2,7 @@ from typing import Optional, Union, List, Tuple
 
 from astropy.modeling import Fittable1DModel, Parameter  # type: ignore
 from scipy.stats import median_abs_deviation  # type: ignore
-from scipy.signal import find_peaks_cwt  # type: ignore
+from scipy.signal import find_peaks  # type: ignore
 
 import numpy as np
 
@@ -73,10 +73,16 @@ RESTFRAME_LINES = [
     (972.5, 'LyG', 'AE'),
 ]
 
+# Columns of RESTFRAME_LINES, used by get_lines() to select the lines
+# without looping over the list at each call
+_RESTFRAME_LAM = np.array([x[0] for x in RESTFRAME_LINES], dtype='float64')
+_RESTFRAME_NAMES_LOWER = np.array([x[1].lower() for x in RESTFRAME_LINES])
+_RESTFRAME_TYPES_LOWER = np.array([x[2].lower() for x in RESTFRAME_LINES])
+
 
 def _normal(x, mu, sigma):
     x = np.array(x, dtype='float64')
-    return np.exp(-((x - mu)**2)/(2*sigma)) / (sigma * np.sqrt(2 * np.pi))
+    return np.exp(-((x - mu)**2)/(2*sigma**2)) / (sigma * np.sqrt(2 * np.pi))
 
 
 class Emission1D(Fittable1DModel):
@@ -106,11 +112,12 @@ class Emission1D(Fittable1DModel):
         :return result: The model values.
 
         """
-        result = np.zeros_like(x, dtype='float64')
-        for candidate_lam in self.line_candidates:
-            mu = candidate_lam / (1 + redshift)
-            result += _normal(x, mu, self.sigma)
-        return result
+        # Evaluate the profiles of all the lines at once, the last axis of
+        # the broadcasted array runs over the lines
+        mu = np.asarray(self.line_candidates, dtype='float64')
+        mu = mu / (1 + redshift)
+        x = np.asarray(x, dtype='float64')
+        return _normal(x[..., np.newaxis], mu, self.sigma).sum(axis=-1)
 
 
 def get_spectrum_lines(
@@ -139,68 +146,70 @@ def get_spectrum_lines(
     """
     if np.isnan(flux).all():
         return []
-    else:
-        flux = np.ma.array(flux.copy(), mask=np.isnan(flux))
 
     if var is None:
         var = 1.0
-    elif isinstance(var, np.ndarray):
-        var = np.ma.array(var.copy(), mask=np.isnan(var))
 
     smoothed_spec = utils.smooth_fft(flux, sigma=smoothing_sigma)
-    smoothed_spec = np.ma.array(smoothed_spec, mask=np.isnan(smoothed_spec))
 
     # Subtract the smoothed spectrum to the spectrum itself to get a
     # crude estimation of the noise, then square it and divide for the variance
-    # and then go back with a square root
-    norm_noise = ((flux - smoothed_spec)**2) / var
-    norm_noise = np.ma.sqrt(norm_noise)
+    # and then go back with a square root. Invalid values (eg. NaNs in the
+    # flux or in the variance) are propagated and excluded from the
+    # statistics below.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        norm_noise = np.sqrt(((flux - smoothed_spec)**2) / var)
+    is_valid = np.isfinite(norm_noise)
+    valid_noise = norm_noise[is_valid]
 
     # Get the median value of the noise. The median is more robust against the
     # presence of lines with respect to the mean
-    noise_median = np.ma.median(norm_noise)
+    noise_median = np.median(valid_noise)
 
     # Get the NMAD of the noise. We assume here that the noise has a
     # unimodal distribution (eg. gaussian like), and this is a good assumption
     # if the noise is due only to the random fluctuations
-    noise_nmad = median_abs_deviation(norm_noise, scale='normal')
+    noise_nmad = median_abs_deviation(valid_noise, scale='normal')
 
     norm_noise_deb = np.abs(norm_noise - noise_median)
 
-    # Get the possible lines
+    # Get the possible lines, invalid values are neither outliers nor inliers
     outlier = norm_noise_deb >= (sigma_threshold * noise_nmad)
+    is_outlier = is_valid & outlier
+    is_inlier = is_valid & ~outlier
 
     # Delete identification with lenght 1 (almost all are fake)
-    for k, v in enumerate(outlier):
-        if (k == 0) or (k == len(outlier)-1):
-            continue
-        if v and ((outlier[k-1] == 0) and (outlier[k+1] == 0)):
-            outlier[k] = 0
-
-    # Get position, width and height of the identifications
-    identifications: List[Tuple[int, float, float, float]] = []
-    c_start = None
-    c_wstart = None
-    c_end = None
-    for k, v in enumerate(outlier):
-        if v:
-            if c_start is None:
-                c_start = k
-                c_wstart = wavelengths[k]
-                c_end = None
-        elif c_start is not None:
-            if c_end is None:
-                c_end = k
-                c_wh = np.ma.max(norm_noise_deb[c_start: c_end])
-                c_wh /= noise_nmad
-                c_max_pos = np.ma.argmax(norm_noise_deb[c_start: c_end])
-                c_pos_idx = c_start + c_max_pos
-                c_wpos = wavelengths[c_pos_idx]
-                c_wlen = wavelengths[k] - c_wstart
-                identifications.append(
-                    (int(c_pos_idx), float(c_wpos), float(c_wlen), float(c_wh))
-                )
-                c_start = None
+    is_outlier[1:-1] &= ~(is_inlier[:-2] & is_inlier[2:])
+
+    # Get the runs of consecutive outliers, a run that is still open at the
+    # end of the spectrum is not considered a line
+    edges = np.diff(is_outlier.astype(np.int8), prepend=np.int8(0))
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1)
+    run_starts = run_starts[:len(run_ends)]
+
+    # Get position, width and height of the identifications. Only valid
+    # values are in the runs, so NaNs do not affect the reductions.
+    run_bounds = np.column_stack((run_starts, run_ends)).ravel()
+    c_wh = np.maximum.reduceat(norm_noise_deb, run_bounds)[::2]
+
+    # The position of a line is the first maximum of its run
+    n_closed = run_ends[-1] if len(run_ends) else 0
+    run_idx = np.flatnonzero(is_outlier[:n_closed])
+    is_max = norm_noise_deb[run_idx] == np.repeat(c_wh, run_ends - run_starts)
+    max_idx = run_idx[is_max]
+    c_pos_idx = max_idx[np.searchsorted(max_idx, run_starts)]
+
+    c_wpos = wavelengths[c_pos_idx]
+    c_wlen = wavelengths[run_ends] - wavelengths[run_starts]
+    c_wh = c_wh / noise_nmad
+
+    identifications: List[Tuple[int, float, float, float]] = list(zip(
+        c_pos_idx.tolist(),
+        np.asarray(c_wpos, dtype=float).tolist(),
+        np.asarray(c_wlen, dtype=float).tolist(),
+        np.asarray(c_wh, dtype=float).tolist()
+    ))
 
     # Sort by height
     identifications.sort(key=lambda a: -a[3])
@@ -235,36 +244,85 @@ def get_lines(
         (wavelenght in Angstrom, Line name, Line type).
 
     """
-    if name is None:
-        selected_lines = RESTFRAME_LINES[:]
-    else:
-        selected_lines = [
-            line
-            for line in RESTFRAME_LINES
-            if name.lower() == line[1].lower()
-        ]
+    selected_lam = (1 + z) * _RESTFRAME_LAM
+    selection = np.ones(len(RESTFRAME_LINES), dtype=bool)
+
+    if name is not None:
+        selection &= _RESTFRAME_NAMES_LOWER == name.lower()
+
     if line_type is not None:
-        selected_lines = [
-            line
-            for line in selected_lines
-            if line_type.lower() in line[2].lower()
-        ]
+        selection &= np.char.find(
+            _RESTFRAME_TYPES_LOWER, line_type.lower()
+        ) >= 0
+
+    if wrange is not None:
+        wrange = np.asarray(wrange, dtype='float64')
+        selection &= selected_lam >= np.nanmin(wrange)
+        selection &= selected_lam <= np.nanmax(wrange)
 
     selected_lines = [
-        ((1 + z) * line[0], line[1], line[2])
-        for line in selected_lines
+        (lam, RESTFRAME_LINES[k][1], RESTFRAME_LINES[k][2])
+        for k, lam in zip(
+            np.flatnonzero(selection).tolist(),
+            selected_lam[selection].tolist()
+        )
     ]
+    return selected_lines
 
-    if wrange is not None:
-        w_min = np.nanmin(wrange)
-        w_max = np.nanmax(wrange)
-        selected_lines = [
-            line
-            for line in selected_lines
-            if w_min <= line[0] <= w_max
-        ]
 
-    return selected_lines
+def _get_redshift_scores(
+    lines_lam: np.ndarray,
+    restframe_lam: np.ndarray,
+    z_values: np.ndarray,
+    sigma: float = 1.0,
+    cutoff: float = 8.0
+) -> np.ndarray:
+    """
+    Score how well a set of lines matches the known lines at each redshift.
+
+    The score of a redshift is the sum of the values of a Gaussian profile
+    centered on each line, evaluated at the position of each known line
+    shifted to that redshift. This is the same as evaluating an Emission1D
+    model at the known lines, but all the redshifts are scored at once.
+
+    Each pair of a line and a known line contributes only to the few
+    redshifts that bring them closer than cutoff * sigma, so the Gaussian
+    profiles are evaluated only there instead of on the whole grid.
+
+    :param lines_lam: Wavelengths of the lines.
+    :param restframe_lam: Rest-frame wavelengths of the known lines.
+    :param z_values: The redshifts to score, sorted in ascending order.
+    :param sigma: The width of the Gaussian profiles. The default is 1.
+    :param cutoff: Distance, in units of sigma, beyond which the Gaussian
+        profiles are considered to be zero. The default is 8, i.e. where
+        the profiles are about 1e-14 times their peak value.
+    :return scores: The score of each redshift.
+    """
+    norm = 1 / (sigma * np.sqrt(2 * np.pi))
+
+    # Range of redshifts where each (known line, line) pair contributes
+    pair_rest = np.repeat(restframe_lam, len(lines_lam))
+    pair_lam = np.tile(lines_lam, len(restframe_lam))
+    z_start = np.searchsorted(
+        z_values, (pair_lam - cutoff * sigma) / pair_rest - 1, side='left'
+    )
+    z_stop = np.searchsorted(
+        z_values, (pair_lam + cutoff * sigma) / pair_rest - 1, side='right'
+    )
+    counts = np.maximum(z_stop - z_start, 0)
+
+    # Indices of the redshifts of all the pairs, concatenated
+    offsets = np.cumsum(counts) - counts
+    z_idx = np.arange(counts.sum()) + np.repeat(z_start - offsets, counts)
+
+    diff = (1 + z_values[z_idx]) * np.repeat(pair_rest, counts)
+    diff -= np.repeat(pair_lam, counts)
+    diff *= diff
+    diff *= -1 / (2 * sigma**2)
+    np.exp(diff, out=diff)
+
+    scores = np.bincount(z_idx, weights=diff, minlength=len(z_values))
+    return scores * norm
 
 
 def get_redshift_from_lines(
@@ -302,8 +360,6 @@ def get_redshift_from_lines(
     if z_points is None:
         z_points = int(5000 * (z_max - z_min) / tol)
 
-    mymodel = Emission1D(identifications, sigma=tol, redshift=0)
-
     z_values = np.linspace(
         start=z_min, stop=z_max, num=z_points
     )
@@ -311,16 +367,14 @@ def get_redshift_from_lines(
     if len(z_values) <= 1:
         return None
 
-    prob_values = np.zeros_like(z_values, dtype=float)
-    for j, z in enumerate(list(z_values)):
-        rest_lines_lam = np.array([
-            x[0] for x in get_lines(z=z)
-        ])
-
-        # We compute the matching at object rest frame so redshift=0
-        prob_values[j] = np.sum(mymodel.evaluate(rest_lines_lam))
+    prob_values = _get_redshift_scores(
+        np.asarray(identifications, dtype='float64'),
+        _RESTFRAME_LAM,
+        z_values,
+        sigma=tol
+    )
 
-    peak_indices = find_peaks_cwt(prob_values, 1)
+    peak_indices, _ = find_peaks(prob_values)
     z_values_p = z_values[peak_indices]
     z_prob_p = prob_values[peak_indices]
 
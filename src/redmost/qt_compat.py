@@ -5,6 +5,7 @@ Note: Based on https://github.com/pytest-dev/pytest-qt
 """
 from __future__ import annotations
 
+import io
 import os
 import sys
 from typing import TYPE_CHECKING
@@ -90,6 +91,7 @@ class QtBackend:
         self.QtTest: Optional[ModuleType] = None
         self.QtWidgets: Optional[ModuleType] = None
         self.QtCharts: Optional[ModuleType] = None
+        self.QOpenGLWidget: Optional[type] = None
 
         self.qInfo: Optional[QtCore.qInfo] = None
         self.qDebug: Optional[QtCore.qDebug] = None
@@ -101,6 +103,9 @@ class QtBackend:
         self.Slot: Optional[Slot] = None
         self.Property: Optional[Property] = None
 
+        # Contents of the UI files already read, see loadUiWidget()
+        self._ui_cache: Dict[str, bytes] = {}
+
         self.set_qt_api()
 
     def _guess_qt_api(self):  # pragma: no cover
@@ -155,6 +160,17 @@ class QtBackend:
         else:
             self.QtCharts = self._import_module("QtCharts")
 
+        # QOpenGLWidget was moved to its own module in Qt6
+        try:
+            if self.qt_api_name in ["pyqt5", "pyside2"]:
+                self.QOpenGLWidget = self.QtWidgets.QOpenGLWidget
+            else:
+                self.QOpenGLWidget = self._import_module(
+                    "QtOpenGLWidgets"
+                ).QOpenGLWidget
+        except (ImportError, AttributeError):
+            self.QOpenGLWidget = None
+
         self._check_qt_api_version()
 
         # qInfo is not exposed in PySide2/6 (#232)
@@ -274,16 +290,24 @@ class QtBackend:
             ui_filename
         )
 
+        try:
+            ui_data = self._ui_cache[ui_file_path]
+        except KeyError:
+            with open(ui_file_path, 'rb') as f:
+                ui_data = f.read()
+            self._ui_cache[ui_file_path] = ui_data
+
         if self.is_pyqt:
             uic = self._import_module("uic")
-            ui = uic.loadUi(ui_file_path)
+            ui = uic.loadUi(io.BytesIO(ui_data))
         elif self.is_pyside:
             uic = self._import_module("QtUiTools")
             loader = uic.QUiLoader()
-            ui_file = self.QtCore.QFile(ui_file_path)
-            ui_file.open(self.QtCore.QIODeviceBase.OpenModeFlag.ReadOnly)
-            ui = loader.load(ui_file, parent)
-            ui_file.close()
+            ui_buffer = self.QtCore.QBuffer()
+            ui_buffer.setData(self.QtCore.QByteArray(ui_data))
+            ui_buffer.open(self.QtCore.QIODeviceBase.OpenModeFlag.ReadOnly)
+            ui = loader.load(ui_buffer, parent)
+            ui_buffer.close()
         else:
             raise ValueError("No valid GUI backend found!")
 
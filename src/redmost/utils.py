@@ -6,7 +6,8 @@ Created on Fri Nov 24 20:38:29 2023.
 @author: Maurizio D'Addona
 """
 import os
-from typing import Optional, Tuple, Union
+from functools import lru_cache
+from typing import Any, Optional, Tuple, Union
 from urllib import request
 import json
 
@@ -20,6 +21,13 @@ try:
 except ImportError:
     from pip._vendor.packaging import version
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    HAS_ORJSON = False
+else:
+    HAS_ORJSON = True
+
 import redmost
 
 
@@ -51,6 +59,49 @@ def check_updates() -> Tuple[bool, str]:
     return is_outdate, str(pypi_version)
 
 
+def dump_json(obj: Any, file_name: str) -> None:
+    """
+    Write an object to a JSON file.
+
+    If orjson is available it is used to encode the object, otherwise the
+    standard json module is used.
+
+    :param obj: The object to serialize.
+    :param file_name: The path of the output file.
+    """
+    if HAS_ORJSON:
+        try:
+            data = orjson.dumps(
+                obj,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+            )
+        except TypeError:
+            # Fallback to the standard module for types orjson cannot handle
+            pass
+        else:
+            with open(file_name, 'wb') as f:
+                f.write(data)
+            return
+
+    with open(file_name, 'w') as f:
+        json.dump(obj, f, indent=2)
+
+
+def load_json(file_name: str) -> Any:
+    """
+    Read an object from a JSON file.
+
+    :param file_name: The path of the input file.
+    :return obj: The deserialized object.
+    """
+    if HAS_ORJSON:
+        with open(file_name, 'rb') as f:
+            return orjson.loads(f.read())
+
+    with open(file_name, 'r') as f:
+        return json.load(f)
+
+
 def get_data_file(filename: str) -> str:
     return os.path.join(
         os.path.abspath(os.path.dirname(__file__)), 'ui',
@@ -77,6 +128,133 @@ def get_icon(
         if os.path.isfile(icon_file):
             return icon_file
 
+def minmax(
+    data: np.ndarray,
+    block_size: int = 8192
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute both the minimum and the maximum of an array along its first axis.
+
+    The array is reduced in blocks small enough to fit in the CPU cache, so
+    that each element is fetched from the main memory only once instead of
+    once for np.min() and once again for np.max().
+
+    :param data: The input array.
+    :param block_size:
+        The number of elements (along the first axis) of each block.
+        The default value is 8192.
+    :return data_min: The minimum value(s) along the first axis.
+    :return data_max: The maximum value(s) along the first axis.
+    """
+    data = np.asarray(data)
+    data_min = np.min(data[:block_size], axis=0)
+    data_max = np.max(data[:block_size], axis=0)
+    for start in range(block_size, data.shape[0], block_size):
+        block = data[start:start + block_size]
+        data_min = np.minimum(data_min, np.min(block, axis=0))
+        data_max = np.maximum(data_max, np.max(block, axis=0))
+    return data_min, data_max
+
+
+def decimate_m4(
+    x_values: np.ndarray,
+    y_values: np.ndarray,
+    n_bins: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce the number of points of a curve with the M4 aggregation.
+
+    The points are split in n_bins contiguous bins and, for each bin, only
+    the first and the last points and the points with the minimum and the
+    maximum y value are kept (in their original order). When each bin spans
+    a column of pixels, the decimated curve is drawn exactly as the
+    original one, including the segments joining adjacent bins.
+
+    :param x_values: The x values of the points.
+    :param y_values: The y values of the points.
+    :param n_bins: The number of bins.
+    :return x_dec: The x values of the decimated curve.
+    :return y_dec: The y values of the decimated curve.
+    """
+    x_values = np.asarray(x_values)
+    y_values = np.asarray(y_values)
+    n_points = len(y_values)
+
+    # Nothing to gain if the bins are not much less than the points
+    if n_bins <= 0 or 4 * n_bins >= n_points:
+        return x_values, y_values
+
+    starts = np.linspace(0, n_points, n_bins, endpoint=False).astype(int)
+    min_idx, max_idx = _get_bin_extremes(y_values, starts)
+
+    sel = np.empty((n_bins, 4), dtype=int)
+    sel[:, 0] = starts
+    sel[:, 1] = np.minimum(min_idx, max_idx)
+    sel[:, 2] = np.maximum(min_idx, max_idx)
+    sel[:, 3] = np.append(starts[1:], n_points) - 1
+    sel = sel.ravel()
+
+    # The indices are sorted, drop the ones repeated in the same bin
+    keep = np.empty(len(sel), dtype=bool)
+    keep[0] = True
+    np.not_equal(sel[1:], sel[:-1], out=keep[1:])
+    sel = sel[keep]
+    return x_values[sel], y_values[sel]
+
+
+def _get_bin_extremes(
+    y_values: np.ndarray,
+    starts: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get the positions of the minimum and the maximum value of each bin.
+
+    :param y_values: The values.
+    :param starts: The index of the first value of each bin.
+    :return min_idx: The index of the first minimum of each bin.
+    :return max_idx: The index of the first maximum of each bin.
+    """
+    n_points = len(y_values)
+    counts = np.diff(np.append(starts, n_points))
+    indices = np.arange(n_points)
+
+    bin_idx: list = []
+    for reduce_func in (np.fmin, np.fmax):
+        # fmin/fmax ignore NaNs, unless a bin contains only NaNs
+        extremes = np.repeat(reduce_func.reduceat(y_values, starts), counts)
+        idx = np.minimum.reduceat(
+            np.where(y_values == extremes, indices, n_points),
+            starts
+        )
+        bin_idx.append(np.where(idx == n_points, starts, idx))
+    return bin_idx[0], bin_idx[1]
+
+
+@lru_cache(maxsize=32)
+def _get_smoothing_window(n: int, m: float, sigma: float) -> np.ndarray:
+    """
+    Get the frequency window used by smooth_fft().
+
+    The windows are cached, since the same spectrum is usually smoothed
+    many times with the same few parameters.
+
+    :param n: The length of the signal to be smoothed.
+    :param m: Parameter to be passed to the function general_gaussian().
+    :param sigma: Parameter to be passed to the function general_gaussian().
+    :return win: The window for the first n//2 + 1 frequencies of the real
+        FFT of the signal. The array is read-only.
+    """
+    win = np.roll(general_gaussian(n, m, sigma), n//2)
+
+    # The input is real, so only half of the spectrum is needed. Since the
+    # window is not exactly Hermitian, its symmetric part is used: this
+    # gives the same result of taking the real part of the full inverse FFT.
+    half = np.arange(n//2 + 1)
+    win = 0.5 * (win[half] + win[(n - half) % n])
+    win.setflags(write=False)
+    return win
+
+
 def smooth_fft(
     data: np.ndarray,
     m: float = 1.0,
@@ -101,17 +279,17 @@ def smooth_fft(
         An optional array containing a boolean mask of values that should be
         masked during the smoothing process, were a True means that the
         corresponding value in the input array is masked.
-    :return: The smoothed array.
+    :return: The smoothed array. Single precision inputs are smoothed and
+        returned in single precision.
     """
     data = np.copy(data)
-    if mask is None:
-        actual_mask: np.ndarray = np.zeros_like(data, dtype=bool)
-    else:
-        actual_mask = mask
+    actual_mask: np.ndarray = ~np.isfinite(data)
+    if mask is not None:
+        actual_mask |= mask
 
-    actual_mask |= ~np.isfinite(data)
-
-    if len(data.shape) > 1:
+    if not np.any(actual_mask):
+        pass
+    elif len(data.shape) > 1:
         for j in range(data.shape[0]):
             data[j, actual_mask[j]] = np.interp(
                 np.flatnonzero(actual_mask[j]),
@@ -126,16 +304,71 @@ def smooth_fft(
         )
 
     xx = np.hstack((data, np.flip(data, axis=axis)))
-    win = np.roll(
-        general_gaussian(xx.shape[axis], m, sigma),
-        xx.shape[axis]//2
-    )
-    fxx = np.fft.fft(xx, axis=axis)
-    xxf = np.real(np.fft.ifft(fxx*win))[..., :data.shape[axis]]
+    n_xx = xx.shape[axis]
+    win = _get_smoothing_window(n_xx, float(m), float(sigma))
+
+    fxx = np.fft.rfft(xx, axis=axis)
+    win = win.astype(fxx.real.dtype, copy=False)
+    xxf = np.fft.irfft(fxx*win, n=n_xx, axis=axis)[..., :data.shape[axis]]
     xxf[actual_mask] = np.nan
     return xxf
 
 
+def smooth_spectrum(
+    wavelengths: np.ndarray,
+    flux: np.ndarray,
+    m: float = 1.0,
+    sigma: float = 25.0
+) -> np.ndarray:
+    """
+    Return a smoothed version of a 1D spectrum.
+
+    smooth_fft() works in pixel space, so spectra that are not sampled on
+    a uniform wavelength grid (eg. log-lambda spectra) are first resampled
+    on a uniform grid with a power of two length, smoothed and then
+    interpolated back to the original wavelengths.
+
+    :param wavelengths: The wavelengths of the spectrum.
+    :param flux: The fluxes of the spectrum.
+    :param m:
+        parameter to be passed to the function general_gaussian().
+        The default value is 1.0.
+    :param sigma:
+        Parameter to be passed to the function general_gaussian().
+        The default value is 25.0.
+    :return: The smoothed fluxes, with the same dtype of the input fluxes.
+        If all the fluxes are NaN, they are returned unchanged.
+    """
+    good = np.isfinite(flux)
+    if not np.any(good):
+        return np.copy(flux)
+
+    # The steps of float32 wavelengths are too noisy to tell whether the
+    # grid is uniform, so work in double precision
+    wavelengths = np.asarray(wavelengths, dtype=np.float64)
+    n_pix = len(flux)
+    steps = np.diff(wavelengths)
+    if (
+        len(steps) < 2 or
+        np.any(steps <= 0) or
+        np.ptp(steps) <= 1e-3 * np.mean(steps)
+    ):
+        return smooth_fft(flux, m=m, sigma=sigma)
+
+    # NOTE: The resampled spectrum covers the same wavelength range with at
+    #       least the same number of pixels, so using the same sigma gives
+    #       about the same smoothing length in wavelength space.
+    n_uniform = 1 << (n_pix - 1).bit_length()
+    wav_good = wavelengths[good]
+    wav_uniform = np.linspace(wav_good[0], wav_good[-1], n_uniform)
+    flux_uniform = np.interp(wav_uniform, wav_good, flux[good])
+
+    smoothed = smooth_fft(flux_uniform.astype(flux.dtype), m=m, sigma=sigma)
+    result = np.interp(wavelengths, wav_uniform, smoothed).astype(flux.dtype)
+    result[~good] = np.nan
+    return result
+
+
 def separate_continuum(
     data: np.ndarray,
     m: float = 1.0,
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Redmost
+
+Tests for the line identification helpers in redmost.lines.
+
+Copyright (C) 2022-2024  Maurizio D'Addona <mauritiusdadd@gmail.com>
+"""
+import numpy as np
+import pytest
+
+from redmost import lines
+
+
+def get_dense_scores(lines_lam, restframe_lam, z_values, sigma):
+    shifted = np.outer(1 + z_values, restframe_lam)
+    diff = shifted[:, :, None] - lines_lam[None, None, :]
+    profiles = lines._normal(diff, 0, sigma)
+    return profiles.sum(axis=(1, 2))
+
+
+@pytest.mark.parametrize("sigma", [0.5, 1.0, 5.0])
+def test_get_redshift_scores(sigma: float):
+    restframe_lam = np.array([3727.0, 4861.3, 4958.9, 5006.8, 6562.8])
+    z_true = 0.4321
+    rng = np.random.default_rng(0)
+    lines_lam = np.concatenate([
+        restframe_lam[1:4] * (1 + z_true) + rng.normal(scale=0.5, size=3),
+        rng.uniform(4000, 9000, size=4)
+    ])
+    z_values = np.linspace(0, 1.5, 3001)
+
+    scores = lines._get_redshift_scores(
+        lines_lam, restframe_lam, z_values, sigma=sigma
+    )
+    dense = get_dense_scores(lines_lam, restframe_lam, z_values, sigma)
+
+    assert scores.shape == z_values.shape
+    np.testing.assert_allclose(scores, dense, rtol=1e-9, atol=1e-12)
+    assert abs(z_values[np.argmax(scores)] - z_true) < 1e-3
+
+
+def test_get_redshift_scores_no_match():
+    restframe_lam = np.array([4861.3, 6562.8])
+    lines_lam = np.array([100.0, 200.0])
+    z_values = np.linspace(0, 1, 101)
+
+    scores = lines._get_redshift_scores(lines_lam, restframe_lam, z_values)
+    assert np.all(scores == 0)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Redmost
+
+Tests for the redrock backend helpers.
+
+Copyright (C) 2022-2024  Maurizio D'Addona <mauritiusdadd@gmail.com>
+"""
+import os
+import pickle
+
+import numpy as np
+import pytest
+from astropy.table import Table  # type: ignore
+
+from redmost.backends import rrock
+
+
+def make_zfit() -> Table:
+    return Table({
+        'targetid': ['000000', '000001', '000001'],
+        'z': [0.1, 0.2, 0.3],
+        'zwarn': [0, 4, 0],
+        'znum': [0, 0, 1],
+        'coeff': np.arange(30, dtype=float).reshape(3, 10),
+        'spectype': ['GALAXY', 'QSO', 'STAR']
+    })
+
+
+def check_zfit(zfit, ref: Table):
+    for name in ref.colnames:
+        np.testing.assert_array_equal(np.asarray(zfit[name]), ref[name])
+
+
+def test_results_round_trip(tmp_path):
+    zfit = make_zfit()
+    out_file = os.path.join(tmp_path, 'rr.result')
+    rrock.dump_results((None, zfit), out_file)
+
+    scandata, loaded = rrock.load_results(out_file)
+    assert scandata is None
+    assert not isinstance(loaded, np.memmap)
+    check_zfit(loaded, zfit)
+
+    zbest = loaded[loaded['znum'] == 0]
+    assert list(zbest['targetid']) == ['000000', '000001']
+
+    # The file must not be kept open by the loaded results
+    os.remove(out_file)
+    assert not os.path.exists(out_file)
+
+
+def test_results_pickle_fallback(tmp_path):
+    zfit = make_zfit()
+    out_file = os.path.join(tmp_path, 'rr.result')
+    with open(out_file, 'wb') as f:
+        pickle.dump(({}, zfit), f)
+
+    scandata, loaded = rrock.load_results(out_file)
+    assert scandata is None
+    check_zfit(loaded, zfit)
+
+
+def test_results_pickled_none(tmp_path):
+    out_file = os.path.join(tmp_path, 'rr.result')
+    with open(out_file, 'wb') as f:
+        pickle.dump(None, f)
+
+    with pytest.raises(ValueError):
+        rrock.load_results(out_file)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Redmost
+
+Tests for the cache of the spectra opened by the GUI.
+
+Copyright (C) 2022-2024  Maurizio D'Addona <mauritiusdadd@gmail.com>
+"""
+import glob
+import os
+import shutil
+import uuid
+
+import numpy as np
+import pytest
+
+from test import TEST_DATA_PATH
+from redmost import gui
+
+
+def make_files(n_files: int):
+    spec_files = sorted(glob.glob(os.path.join(TEST_DATA_PATH, 'spec_*.fits')))
+    return {uuid.uuid4(): file for file in spec_files[:n_files]}
+
+
+def test_spectra_cache_eviction():
+    files = make_files(4)
+    keys = list(files)
+    evicted = []
+    cache = gui.SpectraCache(files, max_loaded=2, on_evict=evicted.append)
+    assert len(cache) == 4
+    assert list(cache) == keys
+
+    sp_0 = cache[keys[0]]
+    sp_1 = cache[keys[1]]
+    assert evicted == []
+    assert cache[keys[0]] is sp_0
+
+    # The least recently used spectrum is the second one
+    cache[keys[2]]
+    assert evicted == [keys[1]]
+    cache[keys[3]]
+    assert evicted == [keys[1], keys[0]]
+
+    # Evicted spectra are read again from their files
+    sp_1_new = cache[keys[1]]
+    assert sp_1_new is not sp_1
+    np.testing.assert_array_equal(sp_1_new.flux, sp_1.flux)
+    assert evicted == [keys[1], keys[0], keys[2]]
+
+
+def test_spectra_cache_files():
+    files = make_files(2)
+    keys = list(files)
+    cache = gui.SpectraCache(files, max_loaded=1)
+
+    # The cache follows the changes of the files dict
+    del files[keys[0]]
+    assert keys[0] not in cache
+    assert len(cache) == 1
+    with pytest.raises(KeyError):
+        cache[keys[0]]
+
+
+def test_spectra_cache_delete():
+    files = make_files(3)
+    keys = list(files)
+    evicted = []
+    cache = gui.SpectraCache(files, max_loaded=3, on_evict=evicted.append)
+    sp_0 = cache[keys[0]]
+
+    # Removing a spectrum removes its file too
+    assert cache.pop(keys[0]) is sp_0
+    assert keys[0] not in files
+    assert evicted == [keys[0]]
+
+    # Spectra not in memory are not reported as evicted
+    del cache[keys[1]]
+    assert list(cache) == [keys[2]]
+    assert evicted == [keys[0]]
+    with pytest.raises(KeyError):
+        del cache[keys[1]]
+
+    # Spectra can be added only after their files
+    with pytest.raises(KeyError):
+        cache[keys[0]] = sp_0
+    files[keys[0]] = 'unused.fits'
+    cache.update({keys[0]: sp_0})
+    assert cache[keys[0]] is sp_0
+
+
+def test_spectra_cache_missing_file(tmp_path):
+    files = make_files(2)
+    keys = list(files)
+    tmp_file = str(tmp_path / 'spec.fits')
+    shutil.copy(files[keys[0]], tmp_file)
+    files[keys[0]] = tmp_file
+    evicted = []
+    cache = gui.SpectraCache(files, max_loaded=1, on_evict=evicted.append)
+
+    cache[keys[0]]
+    cache[keys[1]]
+    assert evicted == [keys[0]]
+
+    # A spectrum whose file is gone can no longer be read
+    os.remove(tmp_file)
+    with pytest.raises(ValueError):
+        cache[keys[0]]
+    assert cache[keys[1]] is not None
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Redmost
+
+Tests for the numerical helpers in redmost.utils.
+
+Copyright (C) 2022-2024  Maurizio D'Addona <mauritiusdadd@gmail.com>
+"""
+import os
+
+import numpy as np
+import pytest
+from scipy.signal.windows import general_gaussian
+
+from redmost import utils
+
+
+@pytest.mark.parametrize("shape", [(1,), (100,), (8192,), (20001,),
+                                   (20001, 3)])
+@pytest.mark.parametrize("block_size", [1, 7, 8192])
+def test_minmax(shape, block_size: int):
+    rng = np.random.default_rng(3)
+    data = rng.normal(size=shape).astype(np.float32)
+
+    data_min, data_max = utils.minmax(data, block_size=block_size)
+    np.testing.assert_array_equal(data_min, np.min(data, axis=0))
+    np.testing.assert_array_equal(data_max, np.max(data, axis=0))
+    assert np.asarray(data_min).dtype == data.dtype
+
+
+def test_minmax_nan():
+    data = np.arange(50000, dtype=float)
+    data[30000] = np.nan
+
+    data_min, data_max = utils.minmax(data, block_size=1000)
+    assert np.isnan(data_min) and np.isnan(data_max)
+
+
+def get_bins(n_points: int, n_bins: int):
+    starts = np.linspace(0, n_points, n_bins, endpoint=False).astype(int)
+    stops = np.append(starts[1:], n_points)
+    return zip(starts.tolist(), stops.tolist())
+
+
+@pytest.mark.parametrize("n_points, n_bins", [(1000, 10), (1037, 64)])
+@pytest.mark.parametrize("with_nans", [False, True])
+def test_decimate_m4(n_points: int, n_bins: int, with_nans: bool):
+    rng = np.random.default_rng(42)
+    x_values = np.arange(n_points, dtype=float)
+    y_values = rng.normal(size=n_points)
+    if with_nans:
+        y_values[rng.choice(n_points, n_points // 10, replace=False)] = np.nan
+        # A bin made only of NaNs
+        y_values[:n_points // n_bins] = np.nan
+
+    x_dec, y_dec = utils.decimate_m4(x_values, y_values, n_bins)
+    kept = x_dec.astype(int)
+
+    assert len(kept) <= 4 * n_bins
+    assert np.all(np.diff(kept) > 0)
+    np.testing.assert_array_equal(y_dec, y_values[kept])
+
+    kept_set = set(kept.tolist())
+    for start, stop in get_bins(n_points, n_bins):
+        assert start in kept_set
+        assert stop - 1 in kept_set
+
+        bin_values = y_values[start:stop]
+        if np.all(np.isnan(bin_values)):
+            continue
+        assert start + int(np.nanargmin(bin_values)) in kept_set
+        assert start + int(np.nanargmax(bin_values)) in kept_set
+
+
+@pytest.mark.parametrize("n_points, n_bins", [(5, 10), (40, 10), (100, 0)])
+def test_decimate_m4_few_points(n_points: int, n_bins: int):
+    x_values = np.arange(n_points, dtype=float)
+    y_values = np.sin(x_values)
+
+    x_dec, y_dec = utils.decimate_m4(x_values, y_values, n_bins)
+    np.testing.assert_array_equal(x_dec, x_values)
+    np.testing.assert_array_equal(y_dec, y_values)
+
+
+def get_smooth_fft_reference(data, m, sigma):
+    # The original formulation, with a complex FFT of the whole signal
+    xx = np.hstack((data, np.flip(data, axis=-1)))
+    win = np.roll(general_gaussian(xx.shape[-1], m, sigma), xx.shape[-1]//2)
+    fxx = np.fft.fft(xx, axis=-1)
+    return np.real(np.fft.ifft(fxx*win))[..., :data.shape[-1]]
+
+
+@pytest.mark.parametrize("n_points", [1000, 1001, 4096])
+@pytest.mark.parametrize("m, sigma", [(1.0, 25.0), (1.5, 7.3)])
+def test_smooth_fft(n_points: int, m: float, sigma: float):
+    rng = np.random.default_rng(4)
+    data = np.sin(np.arange(n_points) / 50) + rng.normal(size=n_points)
+
+    smoothed = utils.smooth_fft(data, m=m, sigma=sigma)
+    np.testing.assert_allclose(
+        smoothed, get_smooth_fft_reference(data, m, sigma),
+        rtol=0, atol=1e-12
+    )
+
+    smoothed_32 = utils.smooth_fft(data.astype(np.float32), m=m, sigma=sigma)
+    assert smoothed_32.dtype == np.float32
+    np.testing.assert_allclose(smoothed_32, smoothed, rtol=0, atol=1e-5)
+
+
+def test_smooth_fft_masked():
+    rng = np.random.default_rng(5)
+    data = rng.normal(size=(3, 500))
+    data[0, 10] = np.nan
+    data[2, 400:] = np.inf
+    mask = np.zeros(data.shape, dtype=bool)
+    mask[1, 100:120] = True
+    mask_copy = mask.copy()
+
+    smoothed = utils.smooth_fft(data, mask=mask)
+    np.testing.assert_array_equal(mask, mask_copy)
+    bad = mask | ~np.isfinite(data)
+    assert np.all(np.isnan(smoothed[bad]))
+    assert np.all(np.isfinite(smoothed[~bad]))
+
+    # The masked values are interpolated before smoothing
+    filled = np.copy(data)
+    for j in range(3):
+        filled[j, bad[j]] = np.interp(
+            np.flatnonzero(bad[j]), np.flatnonzero(~bad[j]), data[j, ~bad[j]]
+        )
+    np.testing.assert_allclose(
+        smoothed[~bad], get_smooth_fft_reference(filled, 1.0, 25.0)[~bad],
+        rtol=0, atol=1e-12
+    )
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_smooth_spectrum_uniform(dtype):
+    rng = np.random.default_rng(1)
+    wavelengths = np.linspace(4750, 9350, 3681).astype(dtype)
+    flux = (np.sin(wavelengths / 200) + rng.normal(size=3681)).astype(dtype)
+    flux[[10, 500, 501]] = np.nan
+
+    smoothed = utils.smooth_spectrum(wavelengths, flux, sigma=30)
+    assert smoothed.dtype == dtype
+    np.testing.assert_array_equal(
+        smoothed, utils.smooth_fft(flux, sigma=30)
+    )
+
+
+def test_smooth_spectrum_log_lambda():
+    rng = np.random.default_rng(2)
+    wavelengths = np.logspace(np.log10(3600), np.log10(9800), 4000)
+    signal = np.sin(wavelengths / 300)
+    flux = signal + rng.normal(scale=0.2, size=4000)
+    flux[[7, 2000]] = np.nan
+
+    smoothed = utils.smooth_spectrum(wavelengths, flux, sigma=30)
+    assert smoothed.shape == flux.shape
+    assert np.all(np.isnan(smoothed[[7, 2000]]))
+    good = np.isfinite(flux)
+    good[:100] = good[-100:] = False
+    assert np.nanstd(smoothed[good] - signal[good]) < 0.05
+
+    smoothed_32 = utils.smooth_spectrum(
+        wavelengths.astype(np.float32), flux.astype(np.float32), sigma=30
+    )
+    assert smoothed_32.dtype == np.float32
+    np.testing.assert_allclose(
+        smoothed_32[good], smoothed[good], rtol=0, atol=1e-3
+    )
+
+
+def test_smooth_spectrum_all_nan():
+    wavelengths = np.logspace(3.5, 4, 100)
+    flux = np.full(100, np.nan, dtype=np.float32)
+
+    smoothed = utils.smooth_spectrum(wavelengths, flux)
+    assert smoothed is not flux
+    assert smoothed.dtype == np.float32
+    assert np.all(np.isnan(smoothed))
+
+
+def make_project_dict():
+    return {
+        'version': 1,
+        'objects': {
+            'a3f2c1d0': {
+                'file': os.path.join('data', 'spec_0001.fits'),
+                'redshift': 1.2345678,
+                'redshift_err': 1e-05,
+                'quality': 3,
+                'flag': None,
+                'visual_inspection': True,
+                'comment': 'H\u03b1 + [N II], n\u00b0 2',
+                'lines': [[6562.8, 2.5], [4861.3, -0.125]],
+                'big_id': 2**70,
+            },
+        },
+        'empty': {},
+    }
+
+
+def test_json_round_trip_without_orjson(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, 'HAS_ORJSON', False)
+    obj = make_project_dict()
+    file_name = str(tmp_path / 'project.json')
+
+    utils.dump_json(obj, file_name)
+    assert utils.load_json(file_name) == obj
+
+
+@pytest.mark.skipif(not utils.HAS_ORJSON, reason="orjson is not installed")
+def test_json_orjson_matches_stdlib(tmp_path, monkeypatch):
+    obj = make_project_dict()
+    # Integers wider than 64 bit go through the stdlib fallback
+    del obj['objects']['a3f2c1d0']['big_id']
+    orjson_file = str(tmp_path / 'orjson.json')
+    stdlib_file = str(tmp_path / 'stdlib.json')
+
+    utils.dump_json(obj, orjson_file)
+    with monkeypatch.context() as m:
+        m.setattr(utils, 'HAS_ORJSON', False)
+        utils.dump_json(obj, stdlib_file)
+        # Each path must read the files written by the other one
+        assert utils.load_json(orjson_file) == obj
+
+    assert utils.load_json(stdlib_file) == obj
+
+    # Same layout, apart from how floats and non-ASCII chars are spelled
+    with open(orjson_file, 'rb') as f:
+        orjson_lines = f.read().decode('utf-8').splitlines()
+    with open(stdlib_file, 'r') as f:
+        stdlib_lines = f.read().splitlines()
+    assert len(orjson_lines) == len(stdlib_lines)
+    for orjson_line, stdlib_line in zip(orjson_lines, stdlib_lines):
+        assert orjson_line.split(':')[0] == stdlib_line.split(':')[0]
+
+
+@pytest.mark.skipif(not utils.HAS_ORJSON, reason="orjson is not installed")
+def test_json_orjson_fallback(tmp_path):
+    obj = make_project_dict()
+    file_name = str(tmp_path / 'project.json')
+
+    utils.dump_json(obj, file_name)
+    assert utils.load_json(file_name) == obj